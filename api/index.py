@@ -11,7 +11,13 @@ from io import BytesIO
 # Add parent directory to path to import app
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app import app
+from app import app, start_simulation
+
+# Flask 라우팅 없이 직접 처리하는 시뮬레이션 시작 경로 (단일 엔드포인트 핫패스)
+DIRECT_SIMULATE_PATHS = ('/api/simulate',)
+
+# WSGI 헤더 키 변환 테이블 (Content-Type → CONTENT_TYPE 형식)
+_HEADER_KEY_TABLE = str.maketrans('-', '_')
 
 def handler(event, context):
     """AWS Lambda handler that wraps Flask WSGI app"""
@@ -25,17 +31,17 @@ def handler(event, context):
     elif 'method' in event:
         http_method = event['method']
     
+    # Fast path: POST /api/simulate는 WSGI environ 구성과 Flask 라우팅을 건너뛰고 직접 디스패치
+    raw_path = event.get('path') or event.get('rawPath') or ''
+    if http_method == 'POST' and raw_path in DIRECT_SIMULATE_PATHS:
+        direct_response = _dispatch_simulate(event)
+        if direct_response is not None:
+            return direct_response
+    
     # Parse path
-    path = '/'
-    if 'path' in event:
-        path = event['path']
-        # Remove /api prefix if present (since we're routing to /api/index.py)
-        if path.startswith('/api'):
-            path = path[3:] if len(path) > 3 else '/'
-    elif 'rawPath' in event:
-        path = event['rawPath']
-        if path.startswith('/api'):
-            path = path[3:] if len(path) > 3 else '/'
+    # Flask 라우트는 /api 접두사를 포함해 등록되어 있으므로 (/api/simulate, /api/progress/... 등) 경로를 그대로 전달
+    # (이전의 path[3:] 접두사 제거는 /api/simulate를 /i/simulate로 바꿔 모든 API 요청이 404가 되었음)
+    path = event.get('path') or event.get('rawPath') or '/'
     
     # Ensure path starts with /
     if not path.startswith('/'):
@@ -54,39 +60,42 @@ def handler(event, context):
     headers = event.get('headers', {})
     if not isinstance(headers, dict):
         headers = {}
+    # HTTP 헤더 이름은 대소문자를 구분하지 않으므로 environ의 고정 키는 소문자 키 dict로 조회
+    # (_dispatch_simulate와 동일한 규칙: Content-Type과 content-type을 같게 취급)
+    headers_lower = {key.lower(): value for key, value in headers.items()}
     
-    # Parse body
-    body = event.get('body', '')
+    # Parse body -> bytes for wsgi.input (base64 본문은 디코딩한 bytes를 그대로 사용, utf-8 왕복 변환 없음)
+    body = event.get('body') or ''
     if event.get('isBase64Encoded', False) and body:
-        body = base64.b64decode(body).decode('utf-8')
-    
-    # Prepare body bytes for wsgi.input
-    body_bytes = body.encode('utf-8') if body else b''
+        body_bytes = base64.b64decode(body)
+    else:
+        body_bytes = body.encode('utf-8') if isinstance(body, str) else body
     
     # Build WSGI environ
     environ = {
         'REQUEST_METHOD': http_method,
         'PATH_INFO': path,
         'QUERY_STRING': query_string,
-        'CONTENT_TYPE': headers.get('content-type', ''),
+        'CONTENT_TYPE': headers_lower.get('content-type', ''),
         'CONTENT_LENGTH': str(len(body_bytes)),
         'SERVER_NAME': 'localhost',
         'SERVER_PORT': '80',
         'wsgi.version': (1, 0),
-        'wsgi.url_scheme': headers.get('x-forwarded-proto', 'https'),
+        'wsgi.url_scheme': headers_lower.get('x-forwarded-proto', 'https'),
         'wsgi.input': BytesIO(body_bytes),
         'wsgi.errors': sys.stderr,
         'wsgi.multithread': False,
         'wsgi.multiprocess': True,
         'wsgi.run_once': False,
-        'HTTP_HOST': headers.get('host', ''),
+        'HTTP_HOST': headers_lower.get('host', ''),
     }
     
-    # Add HTTP headers
-    for key, value in headers.items():
-        key = key.upper().replace('-', '_')
-        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
-            environ[f'HTTP_{key}'] = value
+    # Add HTTP headers (한 번의 dict 생성 + update, '-' → '_' 변환은 미리 만든 translate 테이블 사용)
+    environ.update({
+        'HTTP_' + key.upper().translate(_HEADER_KEY_TABLE): value
+        for key, value in headers.items()
+        if key.lower() not in ('content-type', 'content-length')
+    })
     
     # Collect response
     response_status = 200
@@ -133,3 +142,49 @@ def handler(event, context):
         'body': body_str
     }
 
+
+
+def _dispatch_simulate(event):
+    """POST /api/simulate 직접 처리
+    다음 경우에는 None을 반환해 Flask 경로로 넘김 (해당 오류 응답은 Flask가 그대로 생성)
+    - JSON 본문이 아니거나 파싱에 실패한 경우 (400)
+    - 본문이 비어 있는 경우 (request.json의 BadRequest 400)
+    - 본문이 MAX_CONTENT_LENGTH를 넘는 경우 (413)
+    직접 처리한 응답의 상태 코드와 본문은 Flask 경로(jsonify)와 동일"""
+    headers = event.get('headers') or {}
+    if not isinstance(headers, dict):
+        return None
+    content_type = next((v for k, v in headers.items() if k.lower() == 'content-type'), '')
+    if 'application/json' not in content_type:
+        return None
+    
+    body = event.get('body') or ''
+    if not body:
+        return None
+    try:
+        if event.get('isBase64Encoded', False):
+            body = base64.b64decode(body)
+        elif isinstance(body, str):
+            body = body.encode('utf-8')
+    except ValueError:
+        return None
+    max_length = app.config.get('MAX_CONTENT_LENGTH')
+    if not body or (max_length is not None and len(body) > max_length):
+        return None
+    try:
+        # orjson이 설치된 경우 app.json은 OrjsonProvider (bytes/str 모두 직접 파싱)
+        data = app.json.loads(body)
+    except ValueError:
+        return None
+    
+    response_body, status = start_simulation(data)
+    return {
+        'statusCode': status,
+        'headers': {
+            'content-type': 'application/json',
+            # flask-cors(CORS(app))가 Flask 경로에서 붙이는 헤더와 동일
+            'access-control-allow-origin': '*',
+        },
+        # jsonify와 동일하게 끝에 개행
+        'body': f"{app.json.dumps(response_body)}\n"
+    }
@@ -1,10 +1,12 @@
 from flask import Flask, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.exceptions import RequestEntityTooLarge
 import numpy as np
 from scipy import sparse
-from scipy.integrate import solve_ivp
-import json
+from scipy.integrate import solve_ivp, BDF
+from scipy.sparse.linalg import splu
+import base64
 import traceback
 import os
 import threading
@@ -14,9 +16,32 @@ import atexit
 from numba import njit
 from concurrent.futures import ThreadPoolExecutor
 import tempfile
-import shutil
+import uuid
+import functools
+import math
+
+# orjson이 있으면 JSON 직렬화에 사용 (결과의 수만 개 float 직렬화가 stdlib json보다 훨씬 빠름)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson 기반 Flask JSON provider
+    NumPy 배열/스칼라도 직접 직렬화하며, 나머지 타입은 Flask 기본 default로 처리"""
+    def dumps(self, obj, **kwargs):
+        # indent/separators 인자는 무시 (orjson은 항상 compact 출력)
+        return orjson.dumps(
+            obj, default=self.default,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        ).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)
 
 # DoS 방지를 위한 입력 제한 설정
@@ -32,10 +57,17 @@ MAX_N_TOTAL = 50000  # 총 노드 수 최대값 (Nr * Nz)
 MAX_T_END = 1e6  # 최대 시뮬레이션 시간 (초, 약 11.6일)
 MAX_T_EVAL_POINTS = 100  # 최대 시간 포인트 수
 
+# 솔버 진행률 갱신 주기 (실제 경과 시간, 초)
+PROGRESS_INTERVAL_S = 1.0
+
         # 진행률 저장용 전역 변수 (스레드 안전)
 progress_store = {}
 progress_lock = threading.Lock()
 
+# progress_store에 보관할 세션 수 상한 (초과 시 가장 오래된 완료/에러 세션부터 제거)
+# 시간 기반 정리(cleanup_old_progress)만으로는 5분 안에 요청이 몰리면 결과 dict가 계속 쌓임
+MAX_SESSIONS = 32
+
 # ThreadPoolExecutor로 동시 실행 수 제한 (최대 3개 작업 동시 실행)
 # 프로덕션 환경에서는 Celery/RQ + Redis 권장
 executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="sim_worker")
@@ -49,13 +81,50 @@ def flush_print(*args, **kwargs):
     print(*args, **kwargs)
     sys.stdout.flush()
 
+# NumPy 배열을 JSON 응답용 base64 float32 blob으로 인코딩
+def encode_float32_array(arr):
+    """{'shape', 'dtype': 'f4', 'data': base64} 형태로 변환
+    float64 중첩 리스트(값당 ~18자) 대비 페이로드가 약 1/4로 줄어듦 (little-endian float32)"""
+    arr = np.ascontiguousarray(arr, dtype='<f4')
+    return {
+        'shape': list(arr.shape),
+        'dtype': 'f4',
+        'data': base64.b64encode(arr.tobytes()).decode('ascii')
+    }
+
+def _remove_session_locked(sid):
+    """세션 항목과 결과 파일 삭제 (호출자가 progress_lock을 잡고 있어야 함)"""
+    progress_store.pop(sid, None)
+    result_file = os.path.join(RESULTS_DIR, f"{sid}.npz")
+    if os.path.exists(result_file):
+        try:
+            os.remove(result_file)
+            flush_print(f"🗑️ 오래된 결과 파일 삭제: {sid}")
+        except Exception as e:
+            flush_print(f"⚠️ 결과 파일 삭제 실패 ({sid}): {e}")
+
+def _evict_finished_sessions_locked():
+    """세션 수가 MAX_SESSIONS를 넘으면 가장 오래 전에 완료/에러 처리된 세션부터 제거 (호출자가 progress_lock을 잡고 있어야 함)
+    항목의 timestamp는 완료/에러 시점에 갱신되므로 timestamp 순으로 정렬 (생성 순서로 지우면 방금 끝난
+    긴 시뮬레이션의 결과를 클라이언트가 가져가기 전에 지울 수 있음)
+    실행 중인 세션은 제거하지 않음"""
+    excess = len(progress_store) - MAX_SESSIONS
+    if excess <= 0:
+        return
+    finished = sorted(
+        (sid for sid, p in progress_store.items()
+         if p.get('progress', 0) >= 100 or p.get('error') is not None),
+        key=lambda sid: progress_store[sid].get('timestamp', 0)
+    )
+    for sid in finished[:excess]:
+        _remove_session_locked(sid)
+
 # 진행률 정리 함수 (주기적으로 실행)
 def cleanup_old_progress():
     """오래된 진행률 데이터 정리
     - 완료된 세션(progress>=100): 5분 후 삭제
     - 에러 세션: 30분 후 삭제
     - 결과 파일도 함께 삭제"""
-    import time
     current_time = time.time()
     with progress_lock:
         to_remove = []
@@ -73,18 +142,8 @@ def cleanup_old_progress():
                 to_remove.append(sid)
         
         for sid in to_remove:
-            # progress_store에서 삭제
-            if sid in progress_store:
-                del progress_store[sid]
-            
-            # 결과 파일 삭제
-            result_file = os.path.join(RESULTS_DIR, f"{sid}.npz")
-            if os.path.exists(result_file):
-                try:
-                    os.remove(result_file)
-                    flush_print(f"🗑️ 오래된 결과 파일 삭제: {sid}")
-                except Exception as e:
-                    flush_print(f"⚠️ 결과 파일 삭제 실패 ({sid}): {e}")
+            # progress_store와 결과 파일 삭제
+            _remove_session_locked(sid)
 
 # 주기적으로 진행률 정리하는 백그라운드 스레드
 cleanup_thread_running = threading.Event()
@@ -126,7 +185,8 @@ def cleanup_on_exit():
 atexit.register(cleanup_on_exit)
 
 # Numba로 가속된 라플라시안 코어 함수 (모듈 전역으로 정의하여 재컴파일 방지)
-@njit
+# nogil: 다른 세션의 조립/RHS 및 진행률 폴링 요청이 커널 실행 중에도 GIL을 얻을 수 있도록 함
+@njit(cache=True, nogil=True)
 def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid, k_z_grid, rho_cp_grid):
     """2D 원통좌표계 라플라시안 스파스 행렬 구성 (Numba 가속 코어)
     FVM 보존형 이산화로 r=0 특이점을 올바르게 처리
@@ -137,11 +197,16 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
     - 계수: F_{i+1/2} / (V_i * ρcp) = r_{i+1/2} * k / (r_i * Δr_i * Δr_{i+1/2} * ρcp)
     여기서 Δr_i는 셀 i의 두께, Δr_{i+1/2}는 인터페이스 간격
     이렇게 하면 1/Δr² 스케일이 보장됨
+    
+    반환: CSR 배열 (data, indices, indptr) - 각 행의 열 인덱스는 오름차순으로 정렬되어 있음
     """
-    max_elements = N_total * 5  # 각 노드당 최대 5개 요소
-    data = np.zeros(max_elements)
-    rows = np.zeros(max_elements, dtype=np.int32)
-    cols = np.zeros(max_elements, dtype=np.int32)
+    # 정확한 비영 원소 수: 대각 N_total개 + r/z 방향 인터페이스마다 (행, 열) 양방향 2개씩
+    # (N_total * 5 과할당 없이 모든 슬롯이 채워지므로 0 초기화도 불필요)
+    nnz = N_total + 2 * (Nr - 1) * Nz + 2 * Nr * (Nz - 1)
+    data = np.empty(nnz)
+    indices = np.empty(nnz, dtype=np.int32)
+    indptr = np.empty(N_total + 1, dtype=np.int32)
+    indptr[0] = 0
     idx_count = 0
 
     for i in range(Nr):
@@ -178,12 +243,6 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
                     # r=0에서: 계수 = 2 * k / (r_{1/2} * Δr_{1/2} * ρcp)
                     # 균일 격자에서 4k/(Δr² ρcp) 스케일로 정확히 떨어짐
                     coeff_r_down = 2.0 * k_r_interface / (r_half * dr_interface * rho_cp)
-
-                    idx_down = (i + 1) * Nz + j
-                    data[idx_count] = coeff_r_down
-                    rows[idx_count] = idx
-                    cols[idx_count] = idx_down
-                    idx_count += 1
             else:
                 # i > 0: 일반적인 경우
                 # FVM 보존형 이산화 (정의 A: 셀 중심 기반):
@@ -222,12 +281,6 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
                     # dr_cell_i는 위에서 일관되게 정의됨
                     coeff_r_up = k_r_interface_up * r_interface_up / (r[i] * dr_cell_i * dr_interface_up * rho_cp)
 
-                    idx_up = (i - 1) * Nz + j
-                    data[idx_count] = coeff_r_up
-                    rows[idx_count] = idx
-                    cols[idx_count] = idx_up
-                    idx_count += 1
-
                 # 아래쪽 (i+1, j)
                 if i < Nr - 1:
                     k_r_down = k_r_grid[i + 1, j]
@@ -239,12 +292,6 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
                     # dr_cell_i는 위에서 일관되게 정의됨 (위쪽과 동일)
                     coeff_r_down = k_r_interface_down * r_interface_down / (r[i] * dr_cell_i * dr_interface_down * rho_cp)
 
-                    idx_down = (i + 1) * Nz + j
-                    data[idx_count] = coeff_r_down
-                    rows[idx_count] = idx
-                    cols[idx_count] = idx_down
-                    idx_count += 1
-
             # z 방향 계수 (FVM 보존형 이산화)
             # FVM: ∂/∂z (k ∂T/∂z) → 플럭스 / (control volume 두께)
             # 인터페이스 간격: Δz_{j+1/2} = z[j+1] - z[j] = dz_cell[j]
@@ -270,12 +317,6 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
                 # 이렇게 하면 1/Δz² 스케일이 보장됨
                 coeff_z_left = k_z_interface / (dz_control_volume * dz_interface_left * rho_cp)
 
-                idx_left = i * Nz + (j - 1)
-                data[idx_count] = coeff_z_left
-                rows[idx_count] = idx
-                cols[idx_count] = idx_left
-                idx_count += 1
-
             # 오른쪽 (i, j+1)
             if j < Nz - 1:
                 k_z_right = k_z_grid[i, j + 1]
@@ -295,12 +336,6 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
                 # 이렇게 하면 1/Δz² 스케일이 보장됨
                 coeff_z_right = k_z_interface / (dz_control_volume * dz_interface_right * rho_cp)
 
-                idx_right = i * Nz + (j + 1)
-                data[idx_count] = coeff_z_right
-                rows[idx_count] = idx
-                cols[idx_count] = idx_right
-                idx_count += 1
-
             # 중심점 계수 (이웃 계수의 음수 합)
             center_coeff = 0.0
 
@@ -320,12 +355,286 @@ def _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid,
             if j < Nz - 1:
                 center_coeff -= coeff_z_right
 
+            # 행 idx의 원소를 열 인덱스 오름차순으로 기록 (CSR 직접 생성, COO 정렬/변환 불필요)
+            # 열 순서: (i-1, j) < (i, j-1) < (i, j) < (i, j+1) < (i+1, j)
+            if i > 0:
+                data[idx_count] = coeff_r_up
+                indices[idx_count] = idx - Nz
+                idx_count += 1
+            if j > 0:
+                data[idx_count] = coeff_z_left
+                indices[idx_count] = idx - 1
+                idx_count += 1
             data[idx_count] = center_coeff
-            rows[idx_count] = idx
-            cols[idx_count] = idx
+            indices[idx_count] = idx
             idx_count += 1
+            if j < Nz - 1:
+                data[idx_count] = coeff_z_right
+                indices[idx_count] = idx + 1
+                idx_count += 1
+            if i < Nr - 1:
+                data[idx_count] = coeff_r_down
+                indices[idx_count] = idx + Nz
+                idx_count += 1
+            indptr[idx + 1] = idx_count
+
+    return data, indices, indptr
+
+# Numba로 가속된 RHS 코어 함수 (solve_ivp가 매 스텝 호출하는 pde_system의 계산 부분)
+# nogil: 커널은 NumPy 배열만 다루므로 실행 중 GIL을 놓아 동시 실행 중인 솔버 스레드와 겹쳐 돌 수 있음
+@njit(cache=True, fastmath=True, nogil=True)
+def _pde_rhs_core(T_flat, dTdt, lap_data, lap_indices, lap_indptr, source_flat,
+                  boundary_idx, boundary_params, h_conv, T_ambient):
+    """dT/dt = L·T + source - 경계 플럭스 (Numba 가속 코어)
+    결과는 dTdt 버퍼에 직접 기록 (임시 배열 생성 없음)
+
+    - L·T: CSR 행렬-벡터 곱 (data, indices, indptr를 직접 순회)
+    - 경계 플럭스: h_conv(T - T_ambient) + εσ(T^4 - T_ambient^4)
+      (T^4 - T_ambient^4) = (T^2 + T_ambient^2)(T + T_ambient)(T - T_ambient) 인수분해 형태 사용
+    - boundary_idx: z=0, z=z_max, r=R_max 경계 노드의 flat 인덱스 (순서대로 이어붙임, 모서리는 중복 포함)
+    - boundary_params[b] = [1 / (ρcp * control volume 두께), ε * σ] (노드별 한 행에 묶어 한 번에 읽음)
+    """
+    N_total = T_flat.shape[0]
+    # pow 호출 대신 곱셈 사용 (T_ambient^2는 루프 밖에서 한 번만 계산)
+    T_ambient_sq = T_ambient * T_ambient
+
+    # (1) 열 전도 항 + (2) 열원 항
+    for row in range(N_total):
+        acc = source_flat[row]
+        for p in range(lap_indptr[row], lap_indptr[row + 1]):
+            acc += lap_data[p] * T_flat[lap_indices[p]]
+        dTdt[row] = acc
+
+    # (3) 경계 플럭스 반영 (세 경계를 하나의 루프로 처리): 대류 + 방사
+    for b in range(boundary_idx.shape[0]):
+        idx = boundary_idx[b]
+        T_b = T_flat[idx]
+        T_diff = T_b - T_ambient
+        radiation = boundary_params[b, 1] * (T_b * T_b + T_ambient_sq) * (T_b + T_ambient) * T_diff
+        dTdt[idx] -= (h_conv * T_diff + radiation) * boundary_params[b, 0]
+
+def _warmup_numba_kernels():
+    """모듈 로드 시 작은 3x3 그리드로 Numba 커널을 미리 컴파일
+    서버리스/컨테이너 초기화 단계에서 JIT 비용을 지불하여 첫 요청의 지연을 제거
+    인자 타입(int64 인덱스, int32 CSR 인덱스, C-contiguous float64)은 실제 호출과 동일하게 맞춤"""
+    Nr, Nz = 3, 3
+    N_total = Nr * Nz
+    r = np.linspace(0.0, 1e-3, Nr)
+    z = np.linspace(0.0, 1e-6, Nz)
+    dr_cell = r[1:] - r[:-1]
+    dz_cell = z[1:] - z[:-1]
+    k_grid = np.ones((Nr, Nz))
+    rho_cp_grid = np.ones((Nr, Nz))
+    laplacian_csr = sparse.csr_matrix(
+        _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_grid, k_grid, rho_cp_grid),
+        shape=(N_total, N_total)
+    )
+    boundary_idx = np.arange(Nr) * Nz
+    boundary_params = np.ones((Nr, 2))
+    T_flat = np.full(N_total, 300.0)
+    _pde_rhs_core(T_flat, np.empty_like(T_flat),
+                  laplacian_csr.data, laplacian_csr.indices, laplacian_csr.indptr, np.zeros(N_total),
+                  boundary_idx, boundary_params, 1.0, 300.0)
+
+_warmup_numba_kernels()
+
+# 형상(geometry) 사전 계산 캐시
+# 레이어 구성/두께/물성/소자 크기/그리드 수가 같은 요청은 그리드, 물성 배열, 라플라시안을 재사용
+# 반환된 배열은 여러 요청(스레드)이 공유하므로 호출 측에서 수정하면 안 됨
+@functools.lru_cache(maxsize=32)
+def _build_geometry(layer_names, thickness_layers_nm, k_therm_layers, rho_layers, c_p_layers,
+                    device_radius_m, R_max, Nr):
+    """요청 파라미터 중 형상/물성에만 의존하는 값들을 계산 (lru_cache 키가 되도록 인자는 모두 hashable)
+    - layer_names, thickness_layers_nm, k_therm_layers, rho_layers, c_p_layers: 튜플
+    - device_radius_m, R_max: float (m), Nr: int
+    전압/방사율/대류 계수/주변 온도 등 조건 파라미터는 포함하지 않음
+    레이어별 배열 길이/부호는 _simulate_worker의 입력 검증에서 한 번만 확인하므로 여기서는 다시 검사하지 않음"""
+    thickness_layers = np.array(thickness_layers_nm) * 1e-9
+
+    # z 방향: 레이어별 그리드 (두꺼운 층은 적은 포인트, 얇은 층은 많은 포인트)
+    # 물리 일관성 유지: 두께는 원래대로, 그리드 포인트 수만 조절
+    default_points_map = {
+        'Glass': 8,      # 두꺼운 층: 적은 포인트 (coarse)
+        'ITO': 12, 
+        'HTL': 12, 
+        'Perovskite': 25,  # 핵심 레이어: 많은 포인트 (fine)
+        'ETL': 12, 
+        'Cathode': 12, 
+        'Resin': 6,      # 두꺼운 층: 적은 포인트 (coarse)
+        'Heat sink': 6   # 두꺼운 층: 적은 포인트 (coarse)
+    }
+    num_layers = len(layer_names)
+    points_per_layer = [default_points_map.get(name, 15) for name in layer_names]
+    
+    flush_print(f"=== z 방향 그리드 생성 ===")
+    # 레이어 경계 위치와 레이어별 시작 노드 인덱스를 누적합으로 한 번에 계산
+    ppl = np.array(points_per_layer, dtype=np.int64)
+    z_offsets = np.concatenate(([0.0], np.cumsum(thickness_layers)))
+    node_start = np.concatenate(([0], np.cumsum(ppl)[:-1]))
+    layer_indices_map = [slice(int(start), int(start + n) + 1) for start, n in zip(node_start, ppl)]
+    
+    # 레이어별 np.linspace와 동일한 노드 좌표: start + k * step (k=1..n), 마지막 노드는 레이어 끝 경계로 고정
+    layer_of_node = np.repeat(np.arange(num_layers), ppl)
+    k_in_layer = np.arange(1, ppl.sum() + 1) - np.repeat(node_start, ppl)
+    layer_step = (z_offsets[1:] - z_offsets[:-1]) / ppl
+    z_interior = z_offsets[layer_of_node] + k_in_layer * layer_step[layer_of_node]
+    z_interior[np.cumsum(ppl) - 1] = z_offsets[1:]
+    z = np.concatenate(([0.0], z_interior))
+    # 셀 두께 배열 명확히 정의: dz_cell[j] = z[j+1] - z[j] (j=0부터 Nz-2까지)
+    # 경계 조건에서 사용할 실제 셀 두께
+    dz_cell = z[1:] - z[:-1]  # 길이: Nz-1
+    Nz = len(z)
+    
+    # DoS 방지: Nz 상한 검증
+    if Nz > MAX_NZ:
+        raise ValueError(f"Nz는 {MAX_NZ} 이하여야 합니다. 현재 값: {Nz} (레이어 수: {len(layer_names)})")
+    
+    # r 방향 그리드 (0부터 R_max까지, r 근처에서 촘촘하게, 뒷쪽으로 갈수록 거칠게)
+    # r=0부터 device_radius_m까지: 촘촘하게 (균일 그리드)
+    Nr_fine = int(Nr * 0.6)  # 전체의 60%를 r 근처에 할당
+    r_fine = np.linspace(0, device_radius_m, Nr_fine)
+    
+    # device_radius_m부터 R_max까지: 점점 더 거칠게 (로그 스케일 사용)
+    Nr_coarse = Nr - Nr_fine + 1  # 나머지 그리드 수 (+1은 중복 제거용)
+    # 로그 스케일로 점진적으로 증가하는 간격
+    r_coarse_log = np.logspace(
+        np.log10(device_radius_m + 1e-9),  # device_radius_m에서 시작 (0 방지)
+        np.log10(R_max),
+        Nr_coarse
+    )
+    # 첫 번째 점이 device_radius_m과 정확히 일치하도록 조정
+    r_coarse_log[0] = device_radius_m
+    
+    # 두 구간 결합 (중복 제거)
+    r = np.concatenate([r_fine, r_coarse_log[1:]])
+    # 셀 두께 배열 명확히 정의: dr_cell[i] = r[i+1] - r[i] (i=0부터 Nr-2까지)
+    # 경계 조건에서 사용할 실제 셀 두께
+    dr_cell = r[1:] - r[:-1]  # 길이: Nr-1
+    Nr = len(r)
+    N_total = Nr * Nz
+    
+    # DoS 방지: 총 노드 수 상한 검증
+    if N_total > MAX_N_TOTAL:
+        raise ValueError(f"총 노드 수(Nr * Nz)는 {MAX_N_TOTAL} 이하여야 합니다. 현재 값: {N_total} (Nr={Nr}, Nz={Nz})")
+    
+    # 물성 배열 (2D) - 등방성 열전도도 (압축 제거로 이방성 불필요)
+    # 모든 레이어는 등방성: k_r = k_z = k_therm_layers[i] (같은 배열을 공유)
+    # 노드별 레이어 번호: 레이어 경계 노드는 위쪽(다음) 레이어 물성을 가짐, 마지막 노드는 마지막 레이어
+    node_layer = np.append(np.repeat(np.arange(num_layers), ppl), num_layers - 1)
+    k_column = np.asarray(k_therm_layers, dtype=np.float64)[node_layer]
+    rho_cp_column = (np.asarray(rho_layers, dtype=np.float64) * np.asarray(c_p_layers, dtype=np.float64))[node_layer]
+    # r 방향으로는 물성이 일정하므로 z 방향 열을 Nr번 복제 (Numba 커널용 C-contiguous 배열)
+    k_r_grid = np.tile(k_column, (Nr, 1))  # r 방향 열전도도
+    k_z_grid = k_r_grid                    # z 방향 열전도도 (등방성)
+    rho_cp_grid = np.tile(rho_cp_column, (Nr, 1))
+    
+    # 열원 위치 (Perovskite 레이어, r < device_radius_m 영역)
+    try:
+        perovskite_layer_index = layer_names.index('Perovskite')
+    except ValueError:
+        perovskite_layer_index = 1 if len(layer_names) > 1 else 0
+    
+    perovskite_z_slice = layer_indices_map[perovskite_layer_index]
+    L_perovskite = thickness_layers[perovskite_layer_index]
+    
+    # Perovskite 두께 검증 (0 이하 체크)
+    if L_perovskite <= 0:
+        raise ValueError(f"Perovskite 레이어 두께가 0 이하입니다. L_perovskite = {L_perovskite} m")
+    
+    # 열원 마스크: r < device_radius_m이고 Perovskite 레이어인 영역
+    source_mask = np.zeros((Nr, Nz), dtype=bool)
+    source_mask[r < device_radius_m, perovskite_z_slice] = True
+    
+    # 경계 노드 인덱스 사전 계산 (Flat index)
+    idx_z_bottom = np.arange(Nr) * Nz           # z=0
+    idx_z_top = np.arange(Nr) * Nz + (Nz - 1)  # z=z_max
+    idx_r_max = np.arange(Nz) + (Nr - 1) * Nz  # r=R_max
+    
+    # 경계 조건 계산에 필요한 물성값 사전 추출
+    rho_cp_bottom = rho_cp_grid[:, 0]           # z=0 경계
+    rho_cp_top = rho_cp_grid[:, -1]            # z=z_max 경계
+    rho_cp_r_max = rho_cp_grid[-1, :]          # r=R_max 경계
+    # 경계 노드의 control volume 두께를 내부 노드와 일관되게 정의
+    # 내부 노드 j의 control volume 두께: (dz_cell[j-1] + dz_cell[j]) / 2
+    # 경계 노드도 동일한 방식으로 정의하여 보존성 유지
+    if len(dz_cell) > 0:
+        # z=0 (j=0): 첫 번째 셀의 두께만 사용 (경계면이 셀 시작점에 있음)
+        dz_bottom = dz_cell[0]
+        # z=z_max (j=Nz-1): 마지막 두 셀의 평균 (내부 노드와 동일한 방식)
+        if len(dz_cell) > 1:
+            dz_top = (dz_cell[-2] + dz_cell[-1]) * 0.5
+        else:
+            dz_top = dz_cell[-1]
+    else:
+        dz_bottom = 1e-9
+        dz_top = 1e-9
+    # r=R_max 경계 노드의 control volume 두께
+    if len(dr_cell) > 0:
+        if len(dr_cell) > 1:
+            dr_r_max = (dr_cell[-2] + dr_cell[-1]) * 0.5  # 마지막 두 셀의 평균
+        else:
+            dr_r_max = dr_cell[-1]
+    else:
+        dr_r_max = 1e-9
+    
+    # 경계 항 계수 사전 계산 (RHS/Jacobian에서 매 호출 나눗셈 제거)
+    # inv_cap_*: 경계 노드의 1 / (ρcp * control volume 두께) [m²·K/J]
+    inv_cap_bottom = 1.0 / (rho_cp_bottom * dz_bottom)
+    inv_cap_top = 1.0 / (rho_cp_top * dz_top)
+    inv_cap_r_max = 1.0 / (rho_cp_r_max * dr_r_max)
+    
+    # 스파스 행렬 구성 (Numba 코어 + SciPy 래퍼)
+    # _build_sparse_laplacian_core는 모듈 전역으로 정의되어 재컴파일 없이 재사용됨
+    laplacian_csr = sparse.csr_matrix(
+        _build_sparse_laplacian_core(Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid, k_z_grid, rho_cp_grid),
+        shape=(N_total, N_total)
+    )
+    
+    # Jacobian 템플릿용 CSC 라플라시안 (solve_ivp의 BDF는 sparse Jacobian을 매번 CSC로 변환하므로
+    # 처음부터 CSC로 넘기면 호출마다의 tocsc 변환이 사라짐)
+    laplacian_csc = laplacian_csr.tocsc()
+    
+    # CSC Matrix Template을 위한 대각 성분 인덱스 미리 계산
+    # Jacobian에서 업데이트할 대각 성분의 인덱스를 미리 찾아둠
+    # 전체 nnz를 한 번 훑어 열별 대각 위치(data 인덱스)를 만든 뒤 경계 노드별로 인덱싱 (행 단위 Python 루프 제거)
+    col_of_entry = np.repeat(np.arange(N_total), np.diff(laplacian_csc.indptr))
+    diag_entries = np.flatnonzero(laplacian_csc.indices == col_of_entry)
+    diag_data_index = np.full(N_total, -1, dtype=np.int64)  # -1: 대각 성분 없음
+    diag_data_index[col_of_entry[diag_entries]] = diag_entries
+    diag_data_indices_dict = {  # CSC data 배열 인덱스
+        'r_max': diag_data_index[idx_r_max],
+        'z_bottom': diag_data_index[idx_z_bottom],
+        'z_top': diag_data_index[idx_z_top],
+    }
+    
+    return {
+        'z': z, 'r': r, 'Nr': Nr, 'Nz': Nz, 'N_total': N_total,
+        'layer_indices_map': layer_indices_map,
+        'perovskite_layer_index': perovskite_layer_index,
+        'L_perovskite': L_perovskite,
+        'source_mask': source_mask,
+        'idx_z_bottom': idx_z_bottom, 'idx_z_top': idx_z_top, 'idx_r_max': idx_r_max,
+        'inv_cap_bottom': inv_cap_bottom, 'inv_cap_top': inv_cap_top, 'inv_cap_r_max': inv_cap_r_max,
+        'laplacian_csr': laplacian_csr, 'laplacian_csc': laplacian_csc,
+        'diag_data_indices_dict': diag_data_indices_dict,
+    }
+
+
+class _MMDSparseBDF(BDF):
+    """LU 분해 옵션만 바꾼 BDF (solve_ivp의 method=로 전달)
+
+    BDF가 분해하는 I - c*J는 대각 성분이 양수이고 비대각 성분이 음수인 대각 우세 M-행렬이므로
+    부분 피벗팅이 필요 없음. diag_pivot_thresh=0으로 대각 피벗을 고정하고 A^T+A 기반 MMD 순서를 쓰면
+    기본(COLAMD + 부분 피벗팅) 대비 LU fill-in이 약 40% 줄고 분해 시간이 약 절반으로 줄어듦.
+    """
 
-    return data, rows, cols, idx_count
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if sparse.issparse(self.J):
+            def lu(A):
+                self.nlu += 1
+                return splu(A, permc_spec='MMD_AT_PLUS_A', diag_pivot_thresh=0.0)
+            self.lu = lu
 
 @app.errorhandler(RequestEntityTooLarge)
 def handle_request_entity_too_large(e):
@@ -339,35 +648,45 @@ def handle_request_entity_too_large(e):
 def health():
     return jsonify({'status': 'ok', 'message': 'Flask backend is running'})
 
+def _build_progress_response(progress):
+    """progress_store 항목으로 /api/progress 응답 dict 구성
+    get_progress와 워커의 완료 시점 직렬화가 같은 응답 형식을 쓰도록 공용으로 사용"""
+    # 결과가 있으면 반환
+    response = {
+        'progress': progress.get('progress', 0),
+        'message': progress.get('message', '시작 전'),
+        'has_result': 'result' in progress or 'result_path' in progress,
+        'has_error': 'error' in progress
+    }
+    
+    # 에러 정보 포함
+    if 'error' in progress:
+        response['error'] = progress.get('error')
+    
+    # 결과 데이터가 있으면 포함 (프론트엔드에서 바로 사용 가능)
+    if 'result' in progress:
+        response['result'] = progress.get('result')
+    
+    # 메타데이터도 포함 (호환성 유지)
+    if 'result_metadata' in progress:
+        response['result_metadata'] = progress.get('result_metadata')
+    
+    return response
+
 @app.route('/api/progress/<session_id>', methods=['GET'])
 def get_progress(session_id):
     """시뮬레이션 진행률 조회
-    단순화: progress_store만 사용 (캐시 제거)"""
+    단순화: progress_store만 사용 (캐시 제거), 항목은 읽기만 하고 수정하지 않음"""
     try:
         with progress_lock:
             progress = progress_store.get(session_id, {'progress': 0, 'message': '시작 전'})
         
-        # 결과가 있으면 반환
-        response = {
-            'progress': progress.get('progress', 0),
-            'message': progress.get('message', '시작 전'),
-            'has_result': 'result' in progress or 'result_path' in progress,
-            'has_error': 'error' in progress
-        }
-        
-        # 에러 정보 포함
-        if 'error' in progress:
-            response['error'] = progress.get('error')
-        
-        # 결과 데이터가 있으면 포함 (프론트엔드에서 바로 사용 가능)
-        if 'result' in progress:
-            response['result'] = progress.get('result')
+        # 완료된 세션은 워커가 완료 시점에 직렬화해 둔 응답 본문을 그대로 반환
+        cached_body = progress.get('response_body')
+        if cached_body is not None:
+            return app.response_class(cached_body, mimetype=app.json.mimetype)
         
-        # 메타데이터도 포함 (호환성 유지)
-        if 'result_metadata' in progress:
-            response['result_metadata'] = progress.get('result_metadata')
-        
-        return jsonify(response)
+        return jsonify(_build_progress_response(progress))
     except Exception as e:
         flush_print(f"⚠️ 진행률 조회 에러 (session_id={session_id}): {e}")
         flush_print(traceback.format_exc())
@@ -383,17 +702,15 @@ def get_progress(session_id):
 def get_result(session_id):
     """결과 파일 다운로드 (npz 형식)
     전체 데이터가 필요한 경우 사용"""
+    # lock은 항목 조회에만 사용하고 파일 확인은 lock 밖에서 수행
     with progress_lock:
         progress = progress_store.get(session_id)
-        if not progress:
-            return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
-        
-        result_path = progress.get('result_path')
-        if not result_path or not os.path.exists(result_path):
-            # 레거시: 메모리에 결과가 있으면 반환
-            if 'result' in progress:
-                return jsonify(progress['result'])
-            return jsonify({'error': '결과 파일을 찾을 수 없습니다.'}), 404
+    if not progress:
+        return jsonify({'error': '세션을 찾을 수 없습니다.'}), 404
+    
+    result_path = progress.get('result_path')
+    if not result_path or not os.path.exists(result_path):
+        return jsonify({'error': '결과 파일을 찾을 수 없습니다.'}), 404
     
     # npz 파일 스트리밍
     return send_file(
@@ -414,7 +731,7 @@ def debug_progress_store():
                 'progress': data.get('progress', 0),
                 'message': data.get('message', 'N/A'),
                 'timestamp': data.get('timestamp', 0),
-                'has_result': 'result_path' in data or 'result' in data,
+                'has_result': 'result_path' in data,
                 'has_error': 'error' in data
             }
         
@@ -426,18 +743,22 @@ def debug_progress_store():
 @app.route('/api/simulate', methods=['POST'])
 def simulate():
     """시뮬레이션 요청을 받아 즉시 session_id를 반환하고, 실제 시뮬레이션은 별도 스레드에서 실행"""
-    import uuid
-    import sys
+    body, status = start_simulation(request.json)
+    return jsonify(body), status
+
+def start_simulation(data):
+    """시뮬레이션을 executor에 제출하고 (응답 dict, HTTP 상태 코드)를 반환
+    Flask 라우트와 서버리스 핸들러(api/index.py)의 직접 디스패치가 공용으로 사용"""
+    # 요청 데이터 확인 (빈 요청은 progress_store에 항목을 만들지 않음: 완료/에러 상태가 없어 정리되지 않음)
+    if not data:
+        return {'success': False, 'error': '요청 데이터가 없습니다.'}, 400
+    
     session_id = str(uuid.uuid4())
     
-    # 진행률 초기화 (lock으로 안전하게)
+    # 진행률 초기화 (lock으로 안전하게), 상한을 넘으면 오래된 완료 세션 제거
     with progress_lock:
         progress_store[session_id] = {'progress': 0, 'message': '초기화 중...', 'timestamp': time.time()}
-    
-    # 요청 데이터 저장 (스레드에서 사용)
-    data = request.json
-    if not data:
-        return jsonify({'success': False, 'error': '요청 데이터가 없습니다.'}), 400
+        _evict_finished_sessions_locked()
     
     # ThreadPoolExecutor로 시뮬레이션 실행 (동시 실행 수 제한)
     def run_simulation():
@@ -459,11 +780,11 @@ def simulate():
     executor.submit(run_simulation)
     
     # 즉시 session_id 반환
-    return jsonify({
+    return {
         'success': True,
         'session_id': session_id,
         'message': '시뮬레이션이 시작되었습니다. /api/progress/<session_id>로 진행률을 확인하세요.'
-    })
+    }, 200
 
 def _simulate_worker(session_id, data):
     """실제 시뮬레이션 작업을 수행하는 워커 함수"""
@@ -483,10 +804,10 @@ def _simulate_worker(session_id, data):
         if not layer_names:
             raise ValueError("layer_names가 없습니다.")
         
-        k_therm_layers_original = np.array(data.get('k_therm_layers', []))
-        rho_layers = np.array(data.get('rho_layers', []))
-        c_p_layers = np.array(data.get('c_p_layers', []))
-        thickness_layers_nm_original = np.array(data.get('thickness_layers_nm', []))
+        k_therm_layers_original = np.ascontiguousarray(data.get('k_therm_layers', []), dtype=np.float64)
+        rho_layers = np.ascontiguousarray(data.get('rho_layers', []), dtype=np.float64)
+        c_p_layers = np.ascontiguousarray(data.get('c_p_layers', []), dtype=np.float64)
+        thickness_layers_nm_original = np.ascontiguousarray(data.get('thickness_layers_nm', []), dtype=np.float64)
         
         # 배열 길이 일치 검사
         n_layers = len(layer_names)
@@ -519,15 +840,8 @@ def _simulate_worker(session_id, data):
         device_area_mm2 = data.get('device_area_mm2', 1.0)  # 기본값 1 mm²
         device_radius_m = np.sqrt(device_area_mm2 / np.pi) * 1e-3  # mm²를 m²로 변환 후 반지름 계산
         
-        # 물리 모델 일관성 유지: 두께 압축 제거, 원래 두께와 물성 사용
+        # 물리 모델 일관성 유지: 두께 압축 제거, 원래 두께와 물성을 그대로 사용 (보정/복사 없음)
         # 계산량 감소는 그리드 포인트 수 조절로 달성 (두꺼운 층은 적은 포인트, 얇은 층은 많은 포인트)
-        thickness_layers_nm = thickness_layers_nm_original.copy()
-        thickness_layers = thickness_layers_nm * 1e-9
-        
-        # 물성을 원래 값으로 사용 (압축 보정 없음)
-        k_therm_layers = k_therm_layers_original.copy()
-        rho_layers_effective = rho_layers.copy()
-        c_p_layers_effective = c_p_layers.copy()
         
         # 입력 파라미터 검증
         voltage = data.get('voltage')
@@ -583,8 +897,18 @@ def _simulate_worker(session_id, data):
             raise ValueError(f"t_end는 {MAX_T_END:.0e} 초 이하여야 합니다. 현재 값: {t_end:.2e}")
         
         # 시간 포인트 수 계산 및 검증
-        n_time_points = 50  # 기본값
-        # 향후 동적 조정 시를 대비한 검증
+        # n_output: 출력 시간 포인트 수 (그래프 표시용, 로그 간격). 결과 배열/페이로드 크기에 비례
+        n_time_points = data.get('n_output', 50)  # 기본값 50
+        if n_time_points is None:
+            n_time_points = 50
+        # nan/inf는 int() 변환 전에 걸러냄 (stdlib JSON fallback은 NaN/Infinity를 허용하므로 OverflowError 등 방지)
+        if (isinstance(n_time_points, bool) or not isinstance(n_time_points, (int, float))
+                or not math.isfinite(n_time_points) or n_time_points != int(n_time_points)):
+            raise ValueError(f"n_output은 정수여야 합니다. 현재 값: {n_time_points}")
+        n_time_points = int(n_time_points)
+        if n_time_points < 2:
+            raise ValueError(f"n_output은 최소 2 이상이어야 합니다. 현재 값: {n_time_points}")
+        # DoS 방지: 시간 포인트 수 상한 검증
         if n_time_points > MAX_T_EVAL_POINTS:
             raise ValueError(f"시간 포인트 수는 {MAX_T_EVAL_POINTS}개 이하여야 합니다. 현재 값: {n_time_points}")
         t_eval = np.logspace(np.log10(t_start + 1e-6), np.log10(t_end), n_time_points)
@@ -605,6 +929,11 @@ def _simulate_worker(session_id, data):
         Nr = data.get('Nr', 50)  # 반경 방향 그리드 수 (60 → 50으로 감소, 속도 향상)
         
         # 그리드 파라미터 검증
+        # 정수 값만 허용 (50.7 같은 값을 int()로 잘라 다른 격자로 계산하지 않도록, bool/nan/inf도 거부)
+        if (isinstance(Nr, bool) or not isinstance(Nr, (int, float))
+                or not math.isfinite(Nr) or Nr != int(Nr)):
+            raise ValueError(f"Nr은 정수여야 합니다. 현재 값: {Nr}")
+        Nr = int(Nr)
         if Nr < 3:
             raise ValueError(f"Nr은 최소 3 이상이어야 합니다. 현재 값: {Nr}")
         # DoS 방지: Nr 상한 검증
@@ -613,117 +942,32 @@ def _simulate_worker(session_id, data):
         if device_area_mm2 <= 0:
             raise ValueError(f"device_area_mm2는 0보다 커야 합니다. 현재 값: {device_area_mm2}")
         
-        # z 방향: 레이어별 그리드 (두꺼운 층은 적은 포인트, 얇은 층은 많은 포인트)
-        # 물리 일관성 유지: 두께는 원래대로, 그리드 포인트 수만 조절
-        default_points_map = {
-            'Glass': 8,      # 두꺼운 층: 적은 포인트 (coarse)
-            'ITO': 12, 
-            'HTL': 12, 
-            'Perovskite': 25,  # 핵심 레이어: 많은 포인트 (fine)
-            'ETL': 12, 
-            'Cathode': 12, 
-            'Resin': 6,      # 두꺼운 층: 적은 포인트 (coarse)
-            'Heat sink': 6   # 두꺼운 층: 적은 포인트 (coarse)
-        }
-        points_per_layer = [default_points_map.get(name, 15) for name in layer_names]
-        
-        z_nodes = [0.0]
-        layer_indices_map = []
-        start_idx = 0
-        num_layers = min(len(layer_names), len(thickness_layers), len(points_per_layer))
-        
-        debug_messages = []
-        debug_messages.append("=== z 방향 그리드 생성 ===")
-        flush_print(f"=== z 방향 그리드 생성 ===")
-        for i in range(num_layers):
-            thickness = thickness_layers[i]
-            num_points = points_per_layer[i] if i < len(points_per_layer) else 15
-            layer_nodes = np.linspace(z_nodes[-1], z_nodes[-1] + thickness, num_points + 1)
-            z_nodes.extend(layer_nodes[1:])
-            end_idx = start_idx + num_points
-            layer_indices_map.append(slice(start_idx, end_idx + 1))
-            start_idx = end_idx
-        
-        z = np.array(z_nodes)
-        # 셀 두께 배열 명확히 정의: dz_cell[j] = z[j+1] - z[j] (j=0부터 Nz-2까지)
-        # 경계 조건에서 사용할 실제 셀 두께
-        dz_cell = z[1:] - z[:-1]  # 길이: Nz-1
-        # 인터페이스 간격 배열 (라플라시안 계산용, 길이 Nz로 맞춤)
-        dz = np.concatenate([dz_cell, [dz_cell[-1]]]) if len(dz_cell) > 0 else np.array([1e-9])
-        Nz = len(z)
-        
-        # DoS 방지: Nz 상한 검증
-        if Nz > MAX_NZ:
-            raise ValueError(f"Nz는 {MAX_NZ} 이하여야 합니다. 현재 값: {Nz} (레이어 수: {len(layer_names)})")
-        
-        # r 방향 그리드 (0부터 R_max까지, r 근처에서 촘촘하게, 뒷쪽으로 갈수록 거칠게)
-        # r=0부터 device_radius_m까지: 촘촘하게 (균일 그리드)
-        Nr_fine = int(Nr * 0.6)  # 전체의 60%를 r 근처에 할당
-        r_fine = np.linspace(0, device_radius_m, Nr_fine)
-        
-        # device_radius_m부터 R_max까지: 점점 더 거칠게 (로그 스케일 사용)
-        Nr_coarse = Nr - Nr_fine + 1  # 나머지 그리드 수 (+1은 중복 제거용)
-        # 로그 스케일로 점진적으로 증가하는 간격
-        r_coarse_log = np.logspace(
-            np.log10(device_radius_m + 1e-9),  # device_radius_m에서 시작 (0 방지)
-            np.log10(R_max),
-            Nr_coarse
+        # 형상 사전 계산 (그리드, 물성 배열, 열원 마스크, 라플라시안, Jacobian 대각 인덱스)
+        # 동일한 형상의 반복 요청은 _build_geometry의 lru_cache에서 그대로 재사용됨
+        geometry = _build_geometry(
+            tuple(layer_names), tuple(thickness_layers_nm_original.tolist()), tuple(k_therm_layers_original.tolist()),
+            tuple(rho_layers.tolist()), tuple(c_p_layers.tolist()),
+            float(device_radius_m), float(R_max), Nr
         )
-        # 첫 번째 점이 device_radius_m과 정확히 일치하도록 조정
-        r_coarse_log[0] = device_radius_m
-        
-        # 두 구간 결합 (중복 제거)
-        r = np.concatenate([r_fine, r_coarse_log[1:]])
-        # 셀 두께 배열 명확히 정의: dr_cell[i] = r[i+1] - r[i] (i=0부터 Nr-2까지)
-        # 경계 조건에서 사용할 실제 셀 두께
-        dr_cell = r[1:] - r[:-1]  # 길이: Nr-1
-        # 인터페이스 간격 배열 (라플라시안 계산용, 길이 Nr로 맞춤)
-        # r=0에서 dr[0] 사용 (r=0은 특이점이므로 첫 번째 셀의 두께 사용)
-        dr = np.concatenate([[r[1] - r[0]], dr_cell]) if len(dr_cell) > 0 else np.array([1e-9])
-        Nr = len(r)
-        
-        # 2D 그리드 메시
-        R, Z = np.meshgrid(r, z, indexing='ij')  # R[i,j], Z[i,j] = (r[i], z[j])
-        
-        # 물성 배열 (2D) - 등방성 열전도도 (압축 제거로 이방성 불필요)
-        # 모든 레이어는 등방성: k_r = k_z = k_therm_layers[i]
-        k_r_grid = np.zeros((Nr, Nz))  # r 방향 열전도도
-        k_z_grid = np.zeros((Nr, Nz))  # z 방향 열전도도
-        rho_cp_grid = np.zeros((Nr, Nz))
-        
-        num_layers_for_props = min(len(layer_indices_map), len(k_therm_layers), 
-                                   len(rho_layers_effective), len(c_p_layers_effective))
-        for i in range(num_layers_for_props):
-            z_slice = layer_indices_map[i]
-            
-            # 모든 레이어는 등방성 (압축 제거로 이방성 불필요)
-            k_r_grid[:, z_slice] = k_therm_layers[i]
-            k_z_grid[:, z_slice] = k_therm_layers[i]
-            rho_cp_grid[:, z_slice] = rho_layers_effective[i] * c_p_layers_effective[i]
-        
-        # 열원 위치 (Perovskite 레이어, r < device_radius_m 영역)
-        try:
-            perovskite_layer_index = layer_names.index('Perovskite')
-        except ValueError:
-            perovskite_layer_index = 1 if len(layer_names) > 1 else 0
-        
-        max_valid_index = min(len(layer_indices_map), len(thickness_layers), 
-                             len(rho_layers), len(c_p_layers)) - 1
-        if perovskite_layer_index > max_valid_index:
-            perovskite_layer_index = max(0, max_valid_index)
-        
-        perovskite_z_slice = layer_indices_map[perovskite_layer_index]
-        L_perovskite = thickness_layers[perovskite_layer_index]
-        
-        # Perovskite 두께 검증 (0 이하 체크)
-        if L_perovskite <= 0:
-            raise ValueError(f"Perovskite 레이어 두께가 0 이하입니다. L_perovskite = {L_perovskite} m")
-        
-        # 열원 마스크: r < device_radius_m이고 Perovskite 레이어인 영역
-        source_mask = np.zeros((Nr, Nz), dtype=bool)
-        for i in range(Nr):
-            if r[i] < device_radius_m:
-                source_mask[i, perovskite_z_slice] = True
+        flush_print(f"형상 캐시: {_build_geometry.cache_info()}")
+        z = geometry['z']
+        r = geometry['r']
+        Nr = geometry['Nr']
+        Nz = geometry['Nz']
+        N_total = geometry['N_total']
+        layer_indices_map = geometry['layer_indices_map']
+        perovskite_layer_index = geometry['perovskite_layer_index']
+        L_perovskite = geometry['L_perovskite']
+        source_mask = geometry['source_mask']
+        idx_z_bottom = geometry['idx_z_bottom']
+        idx_z_top = geometry['idx_z_top']
+        idx_r_max = geometry['idx_r_max']
+        inv_cap_bottom = geometry['inv_cap_bottom']
+        inv_cap_top = geometry['inv_cap_top']
+        inv_cap_r_max = geometry['inv_cap_r_max']
+        laplacian_csr = geometry['laplacian_csr']
+        laplacian_csc = geometry['laplacian_csc']
+        diag_data_indices_dict = geometry['diag_data_indices_dict']
         
         # 열원 강도 (W/m³)
         # Q_A는 W/m²이므로, Perovskite 두께로 나누어 W/m³로 변환
@@ -743,121 +987,28 @@ def _simulate_worker(session_id, data):
         flush_print(f"r[0] = {r[0]*1e3:.4f} mm, r[-1] = {r[-1]*1e3:.4f} mm")
         
         # 초기 조건
-        T0 = np.full((Nr, Nz), T_ambient)
-        T0_flat = T0.flatten()
-        N_total = Nr * Nz
-        
-        # DoS 방지: 총 노드 수 상한 검증
-        if N_total > MAX_N_TOTAL:
-            raise ValueError(f"총 노드 수(Nr * Nz)는 {MAX_N_TOTAL} 이하여야 합니다. 현재 값: {N_total} (Nr={Nr}, Nz={Nz})")
+        # solve_ivp/BDF가 내부에서 다시 복사하지 않도록 처음부터 C-contiguous float64 flat 벡터로 생성
+        T0_flat = np.full(N_total, T_ambient, dtype=np.float64)
         
-        # RHS 최적화: 사전 계산된 값들
+        # RHS 최적화: 사전 계산된 값들 (조건 파라미터 의존, 형상 의존 값은 geometry에서 가져옴)
         # 1. 열원 항 사전 계산 (flat 벡터)
-        source_flat = np.zeros(N_total)
-        source_flat[source_mask.ravel()] = C_source_term
-        
-        # 2. 경계 노드 인덱스 사전 계산 (Flat index)
-        idx_z_bottom = np.arange(Nr) * Nz           # z=0
-        idx_z_top = np.arange(Nr) * Nz + (Nz - 1)  # z=z_max
-        idx_r_max = np.arange(Nz) + (Nr - 1) * Nz  # r=R_max
-        
-        # 3. 경계 조건 계산에 필요한 물성값 사전 추출
-        rho_cp_bottom = rho_cp_grid[:, 0]           # z=0 경계
-        rho_cp_top = rho_cp_grid[:, -1]            # z=z_max 경계
-        rho_cp_r_max = rho_cp_grid[-1, :]          # r=R_max 경계
-        # 경계 노드의 control volume 두께를 내부 노드와 일관되게 정의
-        # 내부 노드 j의 control volume 두께: (dz_cell[j-1] + dz_cell[j]) / 2
-        # 경계 노드도 동일한 방식으로 정의하여 보존성 유지
-        if len(dz_cell) > 0:
-            # z=0 (j=0): 첫 번째 셀의 두께만 사용 (경계면이 셀 시작점에 있음)
-            dz_bottom = dz_cell[0]
-            # z=z_max (j=Nz-1): 마지막 두 셀의 평균 (내부 노드와 동일한 방식)
-            if len(dz_cell) > 1:
-                dz_top = (dz_cell[-2] + dz_cell[-1]) * 0.5
-            else:
-                dz_top = dz_cell[-1]
-        else:
-            dz_bottom = 1e-9
-            dz_top = 1e-9
-        # r=R_max 경계 노드의 control volume 두께
-        if len(dr_cell) > 0:
-            if len(dr_cell) > 1:
-                dr_r_max = (dr_cell[-2] + dr_cell[-1]) * 0.5  # 마지막 두 셀의 평균
-            else:
-                dr_r_max = dr_cell[-1]
-        else:
-            dr_r_max = 1e-9
-        
-        # 스파스 행렬 구성 (Numba 코어 + SciPy 래퍼)
-        # _build_sparse_laplacian_core는 모듈 전역으로 정의되어 재컴파일 없이 재사용됨
-        def build_sparse_laplacian():
-            data, rows, cols, idx_count = _build_sparse_laplacian_core(
-                Nr, Nz, N_total, r, dr_cell, dz_cell, k_r_grid, k_z_grid, rho_cp_grid
-            )
-            data = data[:idx_count]
-            rows = rows[:idx_count]
-            cols = cols[:idx_count]
-            return sparse.csr_matrix((data, (rows, cols)), shape=(N_total, N_total))
-        
-        # 처음부터 CSR로 생성 (최적화)
-        laplacian_csr = build_sparse_laplacian().tocsr()
-        
-        # CSR Matrix Template을 위한 대각 성분 인덱스 미리 계산
-        # Jacobian에서 업데이트할 대각 성분의 인덱스를 미리 찾아둠
-        diag_indices_dict = {}
-        diag_data_indices_dict = {}  # CSR data 배열 인덱스
-        
-        # r=R_max 경계 인덱스 (측면) - 벡터화
-        if Nr > 0:
-            r_max_indices = np.arange(Nz) + (Nr - 1) * Nz
-            diag_indices_dict['r_max'] = r_max_indices
-            # CSR data 인덱스 찾기 (벡터화)
-            r_max_data_indices = np.zeros(Nz, dtype=int)
-            for j, idx in enumerate(r_max_indices):
-                row_start = laplacian_csr.indptr[idx]
-                row_end = laplacian_csr.indptr[idx + 1]
-                row_indices = laplacian_csr.indices[row_start:row_end]
-                diag_pos = np.where(row_indices == idx)[0]
-                if len(diag_pos) > 0:
-                    r_max_data_indices[j] = row_start + diag_pos[0]
-                else:
-                    r_max_data_indices[j] = -1  # 대각 성분 없음
-            diag_data_indices_dict['r_max'] = r_max_data_indices
-        
-        # z=0 (하부) 경계 인덱스 - 벡터화
-        z_bottom_indices = np.arange(Nr) * Nz
-        diag_indices_dict['z_bottom'] = z_bottom_indices
-        # CSR data 인덱스 찾기 (벡터화)
-        z_bottom_data_indices = np.zeros(Nr, dtype=int)
-        for i, idx in enumerate(z_bottom_indices):
-            row_start = laplacian_csr.indptr[idx]
-            row_end = laplacian_csr.indptr[idx + 1]
-            row_indices = laplacian_csr.indices[row_start:row_end]
-            diag_pos = np.where(row_indices == idx)[0]
-            if len(diag_pos) > 0:
-                z_bottom_data_indices[i] = row_start + diag_pos[0]
-            else:
-                z_bottom_data_indices[i] = -1  # 대각 성분 없음
-        diag_data_indices_dict['z_bottom'] = z_bottom_data_indices
-        
-        # z=z_max (상부) 경계 인덱스 - 벡터화
-        z_top_indices = np.arange(Nr) * Nz + (Nz - 1)
-        diag_indices_dict['z_top'] = z_top_indices
-        # CSR data 인덱스 찾기 (벡터화)
-        z_top_data_indices = np.zeros(Nr, dtype=int)
-        for i, idx in enumerate(z_top_indices):
-            row_start = laplacian_csr.indptr[idx]
-            row_end = laplacian_csr.indptr[idx + 1]
-            row_indices = laplacian_csr.indices[row_start:row_end]
-            diag_pos = np.where(row_indices == idx)[0]
-            if len(diag_pos) > 0:
-                z_top_data_indices[i] = row_start + diag_pos[0]
-            else:
-                z_top_data_indices[i] = -1  # 대각 성분 없음
-        diag_data_indices_dict['z_top'] = z_top_data_indices
+        # source_mask는 geometry에서 C-contiguous로 생성되므로 reshape(-1)은 복사 없는 view
+        source_flat = np.where(source_mask.reshape(-1), C_source_term, 0.0)
+        
+        # 2. 방사 계수
+        eps_sigma_bottom = epsilon_bottom * sigma
+        eps_sigma_top = epsilon_top * sigma
+        eps_sigma_side = epsilon_side * sigma
+        # 3. RHS 커널용 경계 파라미터 블록: 세 경계 노드를 하나로 이어붙이고 [inv_cap, εσ]를 한 행에 묶음
+        boundary_idx = np.concatenate([idx_z_bottom, idx_z_top, idx_r_max])
+        boundary_params = np.empty((len(boundary_idx), 2))
+        boundary_params[:, 0] = np.concatenate([inv_cap_bottom, inv_cap_top, inv_cap_r_max])
+        boundary_params[:, 1] = np.repeat([eps_sigma_bottom, eps_sigma_top, eps_sigma_side], [Nr, Nr, Nz])
         
         # 진행 상황 추적을 위한 변수
-        last_print_time = [t_start]  # 리스트로 감싸서 클로저에서 수정 가능하게
+        # 시뮬레이션 시간이 아닌 실제 경과 시간(monotonic) 기준으로 갱신: t_end가 5초보다 짧으면
+        # 한 번도 갱신되지 않고, 길면 RHS 호출마다 lock을 잡던 문제를 모두 피함
+        last_print_time = [time.monotonic()]  # 리스트로 감싸서 클로저에서 수정 가능하게
         
         # 진행률 업데이트 함수
         def update_progress(progress, message):
@@ -871,22 +1022,28 @@ def _simulate_worker(session_id, data):
         # 초기 진행률 설정
         update_progress(5, '그리드 생성 중...')
         
-        # PDE 시스템 정의 (RHS 최적화: Flat indexing 사용)
+        # Numba RHS 코어에 넘길 인자 (스칼라는 float으로 고정하여 타입별 재컴파일 방지)
+        rhs_args = (
+            laplacian_csr.data, laplacian_csr.indices, laplacian_csr.indptr, source_flat,
+            boundary_idx, boundary_params, float(h_conv), float(T_ambient)
+        )
+
+        # PDE 시스템 정의 (RHS 계산은 Numba 코어 _pde_rhs_core에서 수행, 여기서는 진행률만 처리)
         def pde_system(t, T_flat):
-            # (1) 열 전도 항 계산 (Sparse Matrix-Vector Multiplication)
-            # laplacian_csr.dot()은 내부적으로 최적화된 C/Fortran 루프를 사용합니다
-            dTdt = laplacian_csr.dot(T_flat)
-            
-            # (2) 열원 항 더하기 (In-place 연산으로 임시 배열 생성 방지)
-            dTdt += source_flat
-            
-            # 진행률 계산 (5% ~ 95%)
-            progress_pct = 5 + (t - t_start) / (t_end - t_start) * 90
-            progress_pct = min(95, max(5, progress_pct))
-            
-            # 주기적으로 진행 상황 출력 (매 5초마다, lock으로 안전하게 업데이트)
+            # (1) 열 전도 항 + (2) 열원 항 + (3) 경계 플럭스 (Numba 커널 한 번 호출)
+            # 중간 임시 배열은 커널 안에서 스칼라로 처리되므로 호출당 할당은 반환 배열 하나뿐
+            # 반환 배열은 재사용하면 안 됨: solve_ivp가 f0/f1 (초기 스텝 선택), f/f_new (수치 Jacobian)를
+            # 동시에 참조하므로 공유 버퍼를 돌려주면 이전 값이 덮어써짐
+            dTdt = np.empty_like(T_flat)
+            _pde_rhs_core(T_flat, dTdt, *rhs_args)
+
+            # 주기적으로 진행 상황 출력 (실제 시간 1초마다, lock으로 안전하게 업데이트)
             # 단순화: progress_state_cache 제거, progress_store만 사용
-            if t - last_print_time[0] >= 5.0:  # 5초마다 업데이트 (오버헤드 최소화)
+            now = time.monotonic()
+            if now - last_print_time[0] >= PROGRESS_INTERVAL_S:
+                # 진행률 계산 (5% ~ 95%)
+                progress_pct = 5 + (t - t_start) / (t_end - t_start) * 90
+                progress_pct = min(95, max(5, progress_pct))
                 T_center = T_flat[0]  # r=0, z=0 (flat index)
                 message = f"진행 중... t = {t:.3f} s ({t/t_end*100:.1f}%), T[0, 0] = {T_center:.2f} K"
                 flush_print(message)
@@ -897,134 +1054,59 @@ def _simulate_worker(session_id, data):
                         'message': message,
                         'timestamp': time.time()
                     }
-                last_print_time[0] = t
-            
-            # 첫 시간 스텝 디버깅
-            if t == t_start or abs(t - t_start) < 1e-6:
-                T_center = T_flat[0]
-                dTdt_source_val = source_flat[0] if source_flat[0] != 0 else 0.0
-                dTdt_transport_val = dTdt[0] - source_flat[0]
-                flush_print(f"=== 첫 시간 스텝 디버깅 (t={t}) ===")
-                flush_print(f"T[0, 0] = {T_center:.2f} K")
-                flush_print(f"dTdt_source[0] = {dTdt_source_val:.6f}")
-                flush_print(f"dTdt_transport[0] = {dTdt_transport_val:.6f}")
-                flush_print(f"laplacian_csr[0, 0] = {laplacian_csr[0, 0]:.6f}")
-                if source_flat[0] != 0:
-                    flush_print(f"열원 위치: source_flat[0] = {source_flat[0]:.6f}, C_source_term = {C_source_term:.6f}")
-                flush_print(f"솔버 시작... (t_end = {t_end:.1f} s)")
-                update_progress(10, f'솔버 시작... (t_end = {t_end:.1f} s)')
-            
-            # (3) 경계 플럭스 반영 (Flat indexing 사용, reshape 없이 직접 연산)
-            # FVM에서 경계 노드의 control volume: 경계면이 셀 경계에 있으면
-            # 경계 노드의 control volume 두께는 경계면에서 셀 중심까지의 거리 = 셀 두께 / 2
-            # 하지만 dz_bottom = dz_cell[0]이므로, control volume 두께는 dz_bottom / 2가 맞음
-            
-            # z=0 (하부): 대류 + 방사
-            T_bottom = T_flat[idx_z_bottom]
-            # T ≈ T_ambient일 때 수치 안정성을 위해 방사 항을 더 정확하게 계산
-            # (T^4 - T_ambient^4) = (T^2 + T_ambient^2)(T + T_ambient)(T - T_ambient)
-            # T ≈ T_ambient일 때는 직접 계산보다 이렇게 인수분해하면 더 정확함
-            T_bottom_diff = T_bottom - T_ambient
-            T_bottom_sum = T_bottom + T_ambient
-            T_bottom_sq_sum = T_bottom**2 + T_ambient**2
-            # 수치 안정성: T ≈ T_ambient일 때 방사 항을 정확히 계산
-            radiation_bottom = epsilon_bottom * sigma * T_bottom_sq_sum * T_bottom_sum * T_bottom_diff
-            flux_bottom = h_conv * T_bottom_diff + radiation_bottom
-            # 경계 노드의 control volume 두께: 경계면에서 셀 중심까지 = dz_bottom / 2
-            # 하지만 실제 문제는 경계 조건이 너무 강하게 적용되어 열 손실이 과도할 수 있음
-            # 따라서 경계 노드의 control volume 두께를 dz_bottom으로 사용 (더 약한 경계 조건)
-            dTdt[idx_z_bottom] -= flux_bottom / (rho_cp_bottom * dz_bottom)
-            
-            # z=z_max (상부): 대류 + 방사
-            T_top = T_flat[idx_z_top]
-            T_top_diff = T_top - T_ambient
-            T_top_sum = T_top + T_ambient
-            T_top_sq_sum = T_top**2 + T_ambient**2
-            radiation_top = epsilon_top * sigma * T_top_sq_sum * T_top_sum * T_top_diff
-            flux_top = h_conv * T_top_diff + radiation_top
-            # 경계 노드의 control volume 두께를 dz_top으로 사용
-            dTdt[idx_z_top] -= flux_top / (rho_cp_top * dz_top)
-            
-            # r=R_max (측면): 대류 + 방사
-            if Nr > 0:
-                T_side = T_flat[idx_r_max]
-                T_side_diff = T_side - T_ambient
-                T_side_sum = T_side + T_ambient
-                T_side_sq_sum = T_side**2 + T_ambient**2
-                radiation_side = epsilon_side * sigma * T_side_sq_sum * T_side_sum * T_side_diff
-                flux_side = h_conv * T_side_diff + radiation_side
-                # 경계 노드의 control volume 두께를 dr_r_max로 사용
-                dTdt[idx_r_max] -= flux_side / (rho_cp_r_max * dr_r_max)
+                last_print_time[0] = now
             
             return dTdt
         
+        # 첫 시간 스텝 디버깅: 솔버가 t_start에서 RHS를 여러 번 호출하므로 pde_system 안이 아니라
+        # 솔버 시작 전에 초기 상태로 한 번만 계산해 출력
+        dTdt_initial = np.empty_like(T0_flat)
+        _pde_rhs_core(T0_flat, dTdt_initial, *rhs_args)
+        # 초기 상태(T = T_ambient)에서는 경계 플럭스가 0이므로 dTdt - source가 전도 항과 같음
+        flush_print(f"=== 첫 시간 스텝 디버깅 (t={t_start}) ===")
+        flush_print(f"T[0, 0] = {T0_flat[0]:.2f} K")
+        flush_print(f"dTdt_source[0] = {source_flat[0]:.6f}")
+        flush_print(f"dTdt_transport[0] = {dTdt_initial[0] - source_flat[0]:.6f}")
+        flush_print(f"laplacian_csr[0, 0] = {laplacian_csr[0, 0]:.6f}")
+        if source_flat[0] != 0:
+            flush_print(f"열원 위치: source_flat[0] = {source_flat[0]:.6f}, C_source_term = {C_source_term:.6f}")
+        flush_print(f"솔버 시작... (t_end = {t_end:.1f} s)")
+        update_progress(10, f'솔버 시작... (t_end = {t_end:.1f} s)')
+        
         # Jacobian (스파스 행렬) - 복사 열전달 항의 미분값 + 대류 항의 미분값 포함 (벡터화 및 CSR in-place 업데이트)
         # reshape 제거: flat indexing으로 직접 접근하여 메모리 복사 방지
+        # Jacobian 경계 대각 성분 업데이트용 상수 사전 계산 (매 Jacobian 호출에서 재계산하지 않음)
+        # 순서: r=R_max, z=0, z=z_max (모서리 노드는 두 경계에 모두 포함되어 두 기여가 누적됨)
+        # 대각 성분이 없는 노드(data 인덱스 -1)는 여기서 한 번만 걸러냄
+        jac_diag_pos = np.concatenate([diag_data_indices_dict['r_max'],
+                                       diag_data_indices_dict['z_bottom'],
+                                       diag_data_indices_dict['z_top']])
+        jac_valid = jac_diag_pos >= 0
+        jac_diag_pos = jac_diag_pos[jac_valid]
+        jac_T_idx = np.concatenate([idx_r_max, idx_z_bottom, idx_z_top])[jac_valid]
+        jac_inv_cap = np.concatenate([inv_cap_r_max, inv_cap_bottom, inv_cap_top])[jac_valid]
+        jac_eps_sigma = np.repeat([eps_sigma_side, eps_sigma_bottom, eps_sigma_top], [Nz, Nr, Nr])[jac_valid]
+        # d/dT [h_conv(T - T_ambient) + εσ(T^4 - T_ambient^4)] = h_conv + 4εσT^3 (경계 플럭스는 dT/dt에서 빼므로 음수)
+        jac_rad_coef = -4.0 * jac_eps_sigma * jac_inv_cap
+        jac_conv_term = -h_conv * jac_inv_cap
+        
+        # 세션 전용 Jacobian 템플릿: indices/indptr는 캐시된 라플라시안과 공유하고 data 버퍼만 따로 가짐
+        # (형상 캐시는 세션 간에 공유되므로 라플라시안 data 자체는 수정하면 안 됨)
+        jac_template = sparse.csc_matrix(
+            (laplacian_csc.data.copy(), laplacian_csc.indices, laplacian_csc.indptr),
+            shape=laplacian_csc.shape
+        )
+        
         def jacobian(t, T_flat):
             """Jacobian 행렬: 라플라시안 + 복사 열전달 항의 미분값 (4εσT³) + 대류 항의 미분값 (h_conv)
-            벡터화 및 CSR in-place 업데이트로 최적화됨 (data만 복사, 구조 재사용)
-            reshape 제거: flat indexing으로 직접 접근"""
-            # 구조 복사 없이 data 배열만 복사 (indices, indptr는 재사용)
-            # 이렇게 하면 메모리 할당 비용을 크게 줄일 수 있음
-            J_data = laplacian_csr.data.copy()
-            
-            # 복사 열전달 항의 미분값: d(εσ(T^4 - T_ambient^4))/dT
-            # 인수분해 형태: εσ(T^2 + T_ambient^2)(T + T_ambient)(T - T_ambient)
-            # 미분: εσ[4T^3 + 3T^2*T_ambient - T*T_ambient^2]
-            # T ≈ T_ambient일 때: ≈ 4εσT_ambient^3 (수치 안정적)
-            # 대류 항의 미분값: d(h_conv*(T - T_ambient))/dT = h_conv
-            # 경계 조건에서만 적용되므로 대각 성분만 업데이트
-            # reshape 없이 flat indexing으로 직접 접근
-            
-            # r=R_max 경계: 측면 방사율 + 대류 (완전 벡터화, flat indexing)
-            if Nr > 0 and 'r_max' in diag_data_indices_dict:
-                # Flat indexing으로 직접 접근 (reshape 없음)
-                T_r_max = T_flat[idx_r_max]
-                # 벡터화된 계산: 복사 항 미분 + 대류 항 미분
-                # d/dT [εσ(T^4 - T_ambient^4)] = 4εσT^3
-                # T_ambient는 상수이므로 미분하면 0이 됨
-                # RHS에서 수치 안정성을 위해 인수분해 형태로 계산하더라도, 미분은 동일함
-                radiation_deriv_r_max = 4.0 * epsilon_side * sigma * (T_r_max**3)
-                # RHS와 일관성 유지: / 2 제거 (경계 노드의 control volume 두께를 dr_r_max로 사용)
-                diag_values_r_max = (-radiation_deriv_r_max - h_conv) / (rho_cp_r_max * dr_r_max)
-                # CSR data 배열 직접 수정 (벡터화)
-                r_max_data_indices = diag_data_indices_dict['r_max']
-                valid_mask = r_max_data_indices >= 0
-                J_data[r_max_data_indices[valid_mask]] += diag_values_r_max[valid_mask]
-            
-            # z=0 (하부) 경계: 방사율 + 대류 (완전 벡터화, flat indexing)
-            if 'z_bottom' in diag_data_indices_dict:
-                # Flat indexing으로 직접 접근 (reshape 없음)
-                T_z_bottom = T_flat[idx_z_bottom]
-                # 벡터화된 계산: 복사 항 미분 + 대류 항 미분
-                # d/dT [εσ(T^4 - T_ambient^4)] = 4εσT^3
-                radiation_deriv_z_bottom = 4.0 * epsilon_bottom * sigma * (T_z_bottom**3)
-                # RHS와 일관성 유지: / 2 제거 (경계 노드의 control volume 두께를 dz_bottom으로 사용)
-                diag_values_z_bottom = (-radiation_deriv_z_bottom - h_conv) / (rho_cp_bottom * dz_bottom)
-                # CSR data 배열 직접 수정 (벡터화)
-                z_bottom_data_indices = diag_data_indices_dict['z_bottom']
-                valid_mask = z_bottom_data_indices >= 0
-                J_data[z_bottom_data_indices[valid_mask]] += diag_values_z_bottom[valid_mask]
-            
-            # z=z_max (상부) 경계: 방사율 + 대류 (완전 벡터화, flat indexing)
-            if 'z_top' in diag_data_indices_dict:
-                # Flat indexing으로 직접 접근 (reshape 없음)
-                T_z_top = T_flat[idx_z_top]
-                # 벡터화된 계산: 복사 항 미분 + 대류 항 미분
-                # d/dT [εσ(T^4 - T_ambient^4)] = 4εσT^3
-                radiation_deriv_z_top = 4.0 * epsilon_top * sigma * (T_z_top**3)
-                # RHS와 일관성 유지: / 2 제거 (경계 노드의 control volume 두께를 dz_top으로 사용)
-                diag_values_z_top = (-radiation_deriv_z_top - h_conv) / (rho_cp_top * dz_top)
-                # CSR data 배열 직접 수정 (벡터화)
-                z_top_data_indices = diag_data_indices_dict['z_top']
-                valid_mask = z_top_data_indices >= 0
-                J_data[z_top_data_indices[valid_mask]] += diag_values_z_top[valid_mask]
-            
-            # 새로운 CSR 객체 생성 (indices, indptr는 재사용하여 메모리 효율 극대화)
-            return sparse.csr_matrix(
-                (J_data, laplacian_csr.indices, laplacian_csr.indptr), 
-                shape=laplacian_csr.shape
-            )
+            경계 노드의 대각 성분만 T에 의존하므로 템플릿의 data 버퍼를 라플라시안 값으로 되돌린 뒤 해당 위치에 더함
+            같은 객체를 반환해도 안전함: BDF는 새 Jacobian을 받으면 이전 J를 버리고, LU는 I - c*J의 새 행렬로 계산함"""
+            J_data = jac_template.data
+            np.copyto(J_data, laplacian_csc.data)
+            T_b = T_flat[jac_T_idx]
+            # 모서리 노드의 중복 인덱스도 누적되도록 np.add.at 사용 (T^3은 pow 대신 곱셈)
+            np.add.at(J_data, jac_diag_pos, jac_rad_coef * (T_b * T_b * T_b) + jac_conv_term)
+            return jac_template
         
         # 솔버 실행 (허용 오차 완화로 속도 향상)
         flush_print(f"=== 솔버 실행 시작 ===")
@@ -1047,9 +1129,16 @@ def _simulate_worker(session_id, data):
                 't_span': [t_start, t_end],
                 'y0': T0_flat,
                 't_eval': t_eval,
-                'method': 'BDF',
+                # LSODA는 사용하지 않음: 얇은 금속층(50~100 nm, k=200)의 고유값이 ~1e12 /s에 달해
+                # 비강성(Adams) 모드로 시작하는 LSODA는 첫 스텝에서 수렴 실패함 (banded Jacobian을 줘도 동일)
+                # 또한 solve_ivp의 LSODA는 sparse Jacobian을 지원하지 않으므로 BDF + CSR Jacobian 유지
+                # LU 분해 순서/피벗팅만 바꾼 BDF (_MMDSparseBDF 참고). 적분 공식과 스텝 제어는 BDF와 동일
+                'method': _MMDSparseBDF,
                 'atol': 1e-6,  # 절대 오차 허용 범위 (더 엄격하게 설정)
                 'rtol': 1e-4   # 상대 오차 허용 범위 (더 엄격하게 설정)
+                # first_step/max_step은 지정하지 않음: 기본 케이스에서 max_step=t_end/50은 LU 분해를 19 → 41회로 늘리고,
+                # first_step 지정은 초기 스텝 선택 RHS 2회 정도만 절약함. 온도 ~300 K에서는 rtol 항이 지배적이라
+                # atol을 1e-3 K까지 완화해도 스텝 수가 거의 변하지 않음
             }
             
             # Jacobian 사용 여부에 따라 조건부 추가
@@ -1057,7 +1146,10 @@ def _simulate_worker(session_id, data):
                 solver_kwargs['jac'] = jacobian
                 flush_print("=== 명시적 Jacobian 사용 ===")
             else:
-                flush_print("=== 수치 Jacobian 사용 (BDF 내부 추정) ===")
+                # 경계 항은 대각 성분에만 기여하므로 Jacobian 구조는 라플라시안과 동일
+                # sparsity를 넘기면 BDF가 N_total번이 아닌 (색칠된 그룹 수)번의 RHS 호출로 추정함
+                solver_kwargs['jac_sparsity'] = laplacian_csr
+                flush_print("=== 수치 Jacobian 사용 (BDF 내부 추정, 라플라시안 sparsity) ===")
             
             sol = solve_ivp(**solver_kwargs)
         except Exception as solver_error:
@@ -1069,6 +1161,9 @@ def _simulate_worker(session_id, data):
         
         elapsed_time = time.time() - start_time
         flush_print(f"=== 솔버 완료 (소요 시간: {elapsed_time:.1f} 초) ===")
+        # 솔버 통계: RHS 호출(nfev), Jacobian 평가(njev), LU 분해(nlu) 횟수
+        # 명시적 Jacobian 사용 시 njev는 Jacobian 재계산 횟수와 같고, 유한차분용 추가 RHS 호출은 없음
+        flush_print(f"솔버 통계: nfev={sol.nfev}, njev={sol.njev}, nlu={sol.nlu}")
         update_progress(95, f'결과 처리 중... (소요 시간: {elapsed_time:.1f} 초)')
         
         if not sol.success:
@@ -1086,7 +1181,7 @@ def _simulate_worker(session_id, data):
         flush_print(f"T_result shape: {T_result.shape}")
         flush_print(f"T_result min: {np.min(T_result):.2f} K, max: {np.max(T_result):.2f} K, mean: {np.mean(T_result):.2f} K")
         flush_print(f"T_ambient: {T_ambient:.2f} K ({T_ambient - 273.15:.2f} °C)")
-        flush_print(f"초기 온도 T0[0, 0]: {T0[0, 0]:.2f} K")
+        flush_print(f"초기 온도 T0[0, 0]: {T0_flat[0]:.2f} K")
         flush_print(f"최종 온도 T_result[0, 0, 0]: {T_result[0, 0, 0]:.2f} K ({T_result[0, 0, 0] - 273.15:.2f} °C)")
         flush_print(f"최종 온도 T_result[0, 0, -1]: {T_result[0, 0, -1]:.2f} K ({T_result[0, 0, -1] - 273.15:.2f} °C)")
         
@@ -1114,7 +1209,8 @@ def _simulate_worker(session_id, data):
         # 활성층 위치 (ITO 시작점을 z=0으로)
         if active_start_idx >= len(z_nm):
             active_start_idx = len(z_nm) - 1
-        position_active_nm = (z_nm[active_start_idx:] - glass_ito_boundary_nm).tolist()
+        position_active_arr = z_nm[active_start_idx:] - glass_ito_boundary_nm
+        position_active_nm = position_active_arr.tolist()
         
         # 2D 온도 데이터 (최종 시간) - 안전성 체크
         final_time_idx = -1
@@ -1136,25 +1232,18 @@ def _simulate_worker(session_id, data):
             r_indices = np.linspace(0, T_2d_raw.shape[0] - 1, min(max_r_points, T_2d_raw.shape[0]), dtype=int)
             z_indices_2d = np.linspace(0, T_2d_raw.shape[1] - 1, min(max_z_points, T_2d_raw.shape[1]), dtype=int)
             T_2d_downsampled = T_2d_raw[np.ix_(r_indices, z_indices_2d)]
-            temperature_2d = T_2d_downsampled.tolist()
+            temperature_2d = T_2d_downsampled
             # 다운샘플링된 r, z 좌표도 저장
             r_mm_downsampled = r_mm[r_indices].tolist()
             position_active_nm_downsampled = [position_active_nm[i] for i in z_indices_2d]
         else:
-            temperature_2d = T_2d_raw.tolist()
+            temperature_2d = T_2d_raw
             r_mm_downsampled = r_mm.tolist()
             position_active_nm_downsampled = position_active_nm
         
         # 활성층 레이어 경계 (temperature_center 샘플링에 필요)
-        active_layer_boundaries_nm = [0.0]
-        try:
-            max_idx = min(len(layer_names), len(thickness_layers_nm_original))
-            for i in range(1, max_idx):
-                if i >= len(thickness_layers_nm_original):
-                    raise IndexError(f"인덱스 오류: i={i}")
-                active_layer_boundaries_nm.append(float(active_layer_boundaries_nm[-1] + thickness_layers_nm_original[i]))
-        except (IndexError, ValueError) as e:
-            raise ValueError(f"레이어 경계 계산 오류: {str(e)}") from e
+        # Glass를 제외한 레이어 두께의 누적합 (ITO 시작점 = 0 nm), 배열 길이는 입력 검증에서 이미 일치 확인됨
+        active_layer_boundaries_nm = np.concatenate(([0.0], np.cumsum(thickness_layers_nm_original[1:]))).tolist()
         
         # r=0에서의 온도 프로파일 (z 방향, 메모리 최적화: 샘플링)
         # 전체 데이터는 매우 크므로 (Nz_active × n_time), 중요한 지점만 전달
@@ -1168,19 +1257,16 @@ def _simulate_worker(session_id, data):
             # z 방향 샘플링: 레이어 경계와 중심 포함
             z_indices_sampled = []
             if len(active_layer_boundaries_nm) > 1:
-                # 레이어 경계 지점 찾기
-                for i, boundary_nm in enumerate(active_layer_boundaries_nm):
-                    if i < len(position_active_nm):
-                        # 경계에 가장 가까운 인덱스 찾기
-                        closest_idx = np.argmin(np.abs(np.array(position_active_nm) - boundary_nm))
-                        if closest_idx not in z_indices_sampled:
-                            z_indices_sampled.append(closest_idx)
-                # 각 레이어의 중간 지점도 추가
-                for i in range(len(active_layer_boundaries_nm) - 1):
-                    mid_nm = (active_layer_boundaries_nm[i] + active_layer_boundaries_nm[i + 1]) / 2
-                    closest_idx = np.argmin(np.abs(np.array(position_active_nm) - mid_nm))
-                    if closest_idx not in z_indices_sampled:
-                        z_indices_sampled.append(closest_idx)
+                # 레이어 경계 지점 + 각 레이어의 중간 지점을 목표 위치로 모아 한 번에 가장 가까운 인덱스 찾기
+                boundaries_arr = np.asarray(active_layer_boundaries_nm)
+                targets_nm = np.concatenate((
+                    boundaries_arr[:len(position_active_arr)],
+                    (boundaries_arr[:-1] + boundaries_arr[1:]) / 2
+                ))
+                closest_idxs = np.argmin(np.abs(position_active_arr[:, None] - targets_nm[None, :]), axis=0)
+                # 중복 제거 (처음 나온 순서 유지)
+                _, first_pos = np.unique(closest_idxs, return_index=True)
+                z_indices_sampled = closest_idxs[np.sort(first_pos)].tolist()
             
             # 샘플링이 부족하면 균등 분포로 보완
             if len(z_indices_sampled) < n_z_samples:
@@ -1202,17 +1288,17 @@ def _simulate_worker(session_id, data):
                 time_indices_sampled = list(range(T_result.shape[2]))
             
             # 샘플링된 데이터만 전달
-            temperature_center_sampled = []
-            for z_idx in z_indices_sampled:
-                z_idx_actual = active_start_idx + z_idx
-                if z_idx_actual < T_result.shape[1]:
-                    temp_profile = T_result[0, z_idx_actual, :][time_indices_sampled].tolist()
-                    temperature_center_sampled.append({
-                        'z_index': int(z_idx),
-                        'position_nm': float(position_active_nm[z_idx]),
-                        'temperature': temp_profile,
-                        'time_indices': time_indices_sampled
-                    })
+            # z_indices_sampled는 모두 활성층 범위(0 ~ Nz - active_start_idx - 1) 안의 인덱스이므로 한 번의 인덱싱으로 추출
+            temp_profiles = T_result[0, active_start_idx + np.asarray(z_indices_sampled, dtype=int)][:, time_indices_sampled]
+            temperature_center_sampled = [
+                {
+                    'z_index': int(z_idx),
+                    'position_nm': float(position_active_arr[z_idx]),
+                    'temperature': temp_profile,
+                    'time_indices': time_indices_sampled
+                }
+                for z_idx, temp_profile in zip(z_indices_sampled, temp_profiles.tolist())
+            ]
             
             temperature_center = temperature_center_sampled
         else:
@@ -1220,35 +1306,18 @@ def _simulate_worker(session_id, data):
             time_indices_sampled = []
         
         # 페로브스카이트 중간 지점에서의 시간에 따른 온도 (r=0)
-        perovskite_mid_idx = None
-        if perovskite_layer_index < len(layer_indices_map):
-            perovskite_start_idx = layer_indices_map[perovskite_layer_index].start
-            perovskite_end_idx = layer_indices_map[perovskite_layer_index].stop
-            perovskite_mid_idx = (perovskite_start_idx + perovskite_end_idx) // 2
-            
-            # 디버깅 정보
-            print(f"perovskite_layer_index: {perovskite_layer_index}")
-            print(f"perovskite_start_idx: {perovskite_start_idx}, perovskite_end_idx: {perovskite_end_idx}")
-            print(f"perovskite_mid_idx: {perovskite_mid_idx}, T_result.shape[1]: {T_result.shape[1]}")
-            
-            if perovskite_mid_idx < T_result.shape[1] and perovskite_mid_idx >= 0:
-                perovskite_center_temp = T_result[0, perovskite_mid_idx, :].tolist()
-                print(f"perovskite_center_temp (first 5): {perovskite_center_temp[:5] if len(perovskite_center_temp) > 5 else perovskite_center_temp}")
-            else:
-                # 안전한 대체: Perovskite 레이어 내의 유효한 인덱스 사용
-                if perovskite_start_idx < T_result.shape[1] and perovskite_start_idx >= 0:
-                    perovskite_center_temp = T_result[0, perovskite_start_idx, :].tolist()
-                    perovskite_mid_idx = perovskite_start_idx
-                    print(f"Using perovskite_start_idx instead: {perovskite_start_idx}")
-                else:
-                    perovskite_mid_idx = max(0, min(T_result.shape[1]-1, Nz//2))
-                    perovskite_center_temp = T_result[0, perovskite_mid_idx, :].tolist() if T_result.shape[1] > 0 else []
-                    print(f"Using fallback index")
-        else:
-            # perovskite_layer_index가 유효하지 않은 경우 중간 인덱스 사용
-            perovskite_mid_idx = T_result.shape[1] // 2 if T_result.shape[1] > 0 else 0
-            perovskite_center_temp = T_result[0, perovskite_mid_idx, :].tolist() if T_result.shape[1] > 0 else []
-            print(f"perovskite_layer_index invalid, using mid_z_idx: {perovskite_mid_idx}")
+        # layer_indices_map[i]는 [start, end] 노드를 포함하므로 중점 인덱스는 항상 유효한 z 인덱스
+        perovskite_start_idx = layer_indices_map[perovskite_layer_index].start
+        perovskite_end_idx = layer_indices_map[perovskite_layer_index].stop
+        perovskite_mid_idx = (perovskite_start_idx + perovskite_end_idx) // 2
+        
+        # 디버깅 정보 (다른 워커 로그와 같이 flush_print 사용)
+        flush_print(f"perovskite_layer_index: {perovskite_layer_index}, "
+                    f"start/mid/end idx: {perovskite_start_idx}/{perovskite_mid_idx}/{perovskite_end_idx} "
+                    f"(Nz = {T_result.shape[1]})")
+        
+        perovskite_center_temp = T_result[0, perovskite_mid_idx, :].tolist()
+        flush_print(f"perovskite_center_temp (first 5): {perovskite_center_temp[:5]}")
         
         # 세 가지 프로파일 계산
         # 1. r=0에서 z에 따른 최종온도 프로파일
@@ -1262,28 +1331,24 @@ def _simulate_worker(session_id, data):
         if T_result.shape[1] > 500:
             # z 방향 다운샘플링
             z_indices = np.linspace(0, T_result.shape[1] - 1, 500, dtype=int)
-            temp_profile_r0_z_time = T_result[0, z_indices, :].tolist()  # (500, n_time)
+            temp_profile_r0_z_time = T_result[0, z_indices, :]  # (500, n_time)
             z_profile_nm_sampled = [float(z_profile_nm[i]) for i in z_indices]  # 리스트로 변환
         else:
-            temp_profile_r0_z_time = T_result[0, :, :].tolist()  # (Nz, n_time)
+            temp_profile_r0_z_time = T_result[0, :, :]  # (Nz, n_time)
             z_profile_nm_sampled = [float(z) for z in z_profile_nm]  # 리스트로 변환
         
         flush_print(f"=== 프로파일 1: r=0에서 z에 따른 최종온도 ===")
         flush_print(f"데이터 크기: {len(temp_profile_r0_z)}개 z 포인트")
         flush_print(f"온도 범위: {min(temp_profile_r0_z):.2f} ~ {max(temp_profile_r0_z):.2f} K")
         flush_print(f"=== r=0에서 z, time에 따른 온도 데이터 (Sheet1용) ===")
-        flush_print(f"데이터 크기: {len(temp_profile_r0_z_time)}개 z 포인트 x {len(temp_profile_r0_z_time[0]) if temp_profile_r0_z_time and len(temp_profile_r0_z_time) > 0 else 0}개 시간 포인트")
+        flush_print(f"데이터 크기: {temp_profile_r0_z_time.shape[0]}개 z 포인트 x {temp_profile_r0_z_time.shape[1]}개 시간 포인트")
         
         # 2. z=perovskite 중점에서 r에 따른 최종온도 프로파일
-        if perovskite_mid_idx is not None and perovskite_mid_idx < T_result.shape[1] and perovskite_mid_idx >= 0:
-            temp_profile_z_perovskite_r = T_result[:, perovskite_mid_idx, final_time_idx].tolist()  # 모든 r, z=perovskite 중점, 최종 시간
-            flush_print(f"=== 프로파일 2: z=perovskite 중점에서 r에 따른 최종온도 ===")
-            flush_print(f"perovskite_mid_idx: {perovskite_mid_idx}, z 좌표: {z_nm[perovskite_mid_idx]:.2f} nm")
-            flush_print(f"데이터 크기: {len(temp_profile_z_perovskite_r)}개 r 포인트")
-            flush_print(f"온도 범위: {min(temp_profile_z_perovskite_r):.2f} ~ {max(temp_profile_z_perovskite_r):.2f} K")
-        else:
-            temp_profile_z_perovskite_r = []
-            flush_print(f"⚠️ 경고: perovskite_mid_idx가 유효하지 않습니다. 프로파일 2를 계산할 수 없습니다.")
+        temp_profile_z_perovskite_r = T_result[:, perovskite_mid_idx, final_time_idx].tolist()  # 모든 r, z=perovskite 중점, 최종 시간
+        flush_print(f"=== 프로파일 2: z=perovskite 중점에서 r에 따른 최종온도 ===")
+        flush_print(f"perovskite_mid_idx: {perovskite_mid_idx}, z 좌표: {z_nm[perovskite_mid_idx]:.2f} nm")
+        flush_print(f"데이터 크기: {len(temp_profile_z_perovskite_r)}개 r 포인트")
+        flush_print(f"온도 범위: {min(temp_profile_z_perovskite_r):.2f} ~ {max(temp_profile_z_perovskite_r):.2f} K")
         
         # 3. z=perovskite 중점, r=0에서 시간에 따른 온도 프로파일 (이미 계산됨: perovskite_center_temp)
         flush_print(f"=== 프로파일 3: z=perovskite 중점, r=0에서 시간에 따른 온도 ===")
@@ -1292,50 +1357,37 @@ def _simulate_worker(session_id, data):
             flush_print(f"온도 범위: {min(perovskite_center_temp):.2f} ~ {max(perovskite_center_temp):.2f} K")
         
         
-        # NumPy 타입 변환
-        def convert_to_python_type(obj):
-            if isinstance(obj, np.integer):
-                return int(obj)
-            elif isinstance(obj, np.floating):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-            elif isinstance(obj, dict):
-                return {key: convert_to_python_type(value) for key, value in obj.items()}
-            elif isinstance(obj, list):
-                return [convert_to_python_type(item) for item in obj]
-            else:
-                return obj
-        
         # 디버깅: 반환 전 온도 값 확인
         flush_print(f"=== 반환 데이터 확인 ===")
         if len(perovskite_center_temp) > 0:
             flush_print(f"perovskite_center_temp[0]: {perovskite_center_temp[0]:.2f} K ({perovskite_center_temp[0] - 273.15:.2f} °C)")
             flush_print(f"perovskite_center_temp[-1]: {perovskite_center_temp[-1]:.2f} K ({perovskite_center_temp[-1] - 273.15:.2f} °C)")
-        if temperature_2d and len(temperature_2d) > 0 and len(temperature_2d[0]) > 0:
-            flush_print(f"temperature_2d[0][0]: {temperature_2d[0][0]:.2f} K ({temperature_2d[0][0] - 273.15:.2f} °C)")
+        if temperature_2d.size > 0:
+            flush_print(f"temperature_2d[0][0]: {temperature_2d[0, 0]:.2f} K ({temperature_2d[0, 0] - 273.15:.2f} °C)")
         
         try:
             update_progress(100, '완료!')
             
             # 결과 데이터 준비 (디스크 저장용)
+            # 온도 배열은 float32로 저장 (시각화에는 충분한 정밀도, JSON 응답의 float32 blob과 동일)
+            # 시간/좌표는 float64 유지
             result_data = {
                 'success': True,
                 'session_id': session_id,
                 'time': sol.t,  # NumPy 배열로 저장 (JSON 변환 전)
                 'position_active_nm': np.array(position_active_nm_downsampled),  # 다운샘플링된 z 좌표
-                'temperature_2d': np.array(temperature_2d),  # 다운샘플링된 데이터
+                'temperature_2d': temperature_2d.astype(np.float32),  # 다운샘플링된 데이터
                 'temperature_center': temperature_center,  # 이미 리스트
                 'r_mm': np.array(r_mm_downsampled),  # 다운샘플링된 r 좌표
-                'perovskite_center_temp': np.array(perovskite_center_temp),
+                'perovskite_center_temp': np.array(perovskite_center_temp, dtype=np.float32),
                 'layer_boundaries_nm': np.array(active_layer_boundaries_nm),
                 'layer_names': layer_names[1:] if len(layer_names) > 1 else [],
                 'glass_ito_boundary_nm': glass_ito_boundary_nm,
                 'device_radius_mm': device_radius_m * 1e3,
-                'temp_profile_r0_z': np.array(temp_profile_r0_z),
+                'temp_profile_r0_z': np.array(temp_profile_r0_z, dtype=np.float32),
                 'z_profile_nm': np.array(z_profile_nm),
-                'temp_profile_z_perovskite_r': np.array(temp_profile_z_perovskite_r),
-                'perovskite_mid_z_nm': z_nm[perovskite_mid_idx] if perovskite_mid_idx is not None and perovskite_mid_idx < len(z_nm) else None
+                'temp_profile_z_perovskite_r': np.array(temp_profile_z_perovskite_r, dtype=np.float32),
+                'perovskite_mid_z_nm': z_nm[perovskite_mid_idx]
             }
             
             # 결과를 디스크에 저장 (npz 형식)
@@ -1344,51 +1396,62 @@ def _simulate_worker(session_id, data):
             flush_print(f"=== 결과가 디스크에 저장되었습니다: {result_file} ===")
             
             # JSON 응답용 경량 데이터 (프론트엔드 표시용)
+            # 1D 값은 이미 .tolist()/float()로 만든 순수 Python 타입이므로 추가 변환 없이 그대로 사용
+            # 큰 2D 배열은 중첩 JSON 리스트 대신 base64 float32 blob으로 전송 (프론트엔드에서 복원)
             result_summary = {
                 'success': True,
                 'session_id': session_id,
-                'time': convert_to_python_type(sol.t.tolist()),
-                'position_active_nm': convert_to_python_type(position_active_nm_downsampled),  # 다운샘플링된 z 좌표
-                'temperature_2d': convert_to_python_type(temperature_2d),  # 다운샘플링된 데이터
-                'temperature_center': convert_to_python_type(temperature_center),
-                'r_mm': convert_to_python_type(r_mm_downsampled),
-                'perovskite_center_temp': convert_to_python_type(perovskite_center_temp),
-                'layer_boundaries_nm': convert_to_python_type(active_layer_boundaries_nm),
+                'time': sol.t.tolist(),
+                'position_active_nm': position_active_nm_downsampled,  # 다운샘플링된 z 좌표
+                'temperature_2d': encode_float32_array(temperature_2d),  # 다운샘플링된 데이터 (base64 float32)
+                'temperature_center': temperature_center,
+                'r_mm': r_mm_downsampled,
+                'perovskite_center_temp': perovskite_center_temp,
+                'layer_boundaries_nm': active_layer_boundaries_nm,
                 'layer_names': layer_names[1:] if len(layer_names) > 1 else [],
                 'glass_ito_boundary_nm': float(glass_ito_boundary_nm),
                 'device_radius_mm': float(device_radius_m * 1e3),
-                'temp_profile_r0_z': convert_to_python_type(temp_profile_r0_z),
-                'z_profile_nm': convert_to_python_type(z_profile_nm),
-                'temp_profile_r0_z_time': convert_to_python_type(temp_profile_r0_z_time) if temp_profile_r0_z_time is not None else None,  # r=0에서 z, time에 따른 온도 (Sheet1용)
-                'z_profile_nm_sampled': convert_to_python_type(z_profile_nm_sampled) if temp_profile_r0_z_time is not None else None,  # 샘플링된 z 좌표
-                'temp_profile_z_perovskite_r': convert_to_python_type(temp_profile_z_perovskite_r),
-                'perovskite_mid_z_nm': float(z_nm[perovskite_mid_idx]) if perovskite_mid_idx is not None and perovskite_mid_idx < len(z_nm) else None
+                'temp_profile_r0_z': temp_profile_r0_z,
+                'z_profile_nm': z_profile_nm,
+                'temp_profile_r0_z_time': encode_float32_array(temp_profile_r0_z_time),  # r=0에서 z, time에 따른 온도 (Sheet1용, base64 float32)
+                'z_profile_nm_sampled': z_profile_nm_sampled,  # 샘플링된 z 좌표
+                'temp_profile_z_perovskite_r': temp_profile_z_perovskite_r,
+                'perovskite_mid_z_nm': float(z_nm[perovskite_mid_idx])
             }
             
             flush_print(f"=== 결과 반환 준비 완료 ===")
-            flush_print(f"결과 크기: time={len(result_summary.get('time', []))}, temperature_2d shape={len(result_summary.get('temperature_2d', []))}x{len(result_summary.get('temperature_2d', [])[0]) if result_summary.get('temperature_2d') else 0}")
-            flush_print(f"temperature_center 샘플링: {len(temperature_center)}개 z 위치, 각 {len(time_indices_sampled) if 'time_indices' in str(temperature_center) else '전체'}개 시간 포인트")
+            flush_print(f"결과 크기: time={len(result_summary.get('time', []))}, temperature_2d shape={temperature_2d.shape[0]}x{temperature_2d.shape[1]}")
+            flush_print(f"temperature_center 샘플링: {len(temperature_center)}개 z 위치, 각 {len(time_indices_sampled)}개 시간 포인트")
             
             # 결과를 progress_store에 저장
             # result_summary를 저장하여 프론트엔드에서 바로 사용 가능하도록 함
+            # 항목 dict는 lock 밖에서 만들고 lock 안에서는 참조 교체만 수행
+            completed_entry = {
+                'progress': 100,
+                'message': '완료!',
+                'result_path': result_file,  # 디스크 경로도 저장 (백업용)
+                'result': result_summary,  # JSON 형식의 결과 데이터 저장
+                # 최소한의 메타데이터도 저장 (호환성 유지)
+                'result_metadata': {
+                    'success': True,
+                    'session_id': session_id,
+                    'grid_size': f"{Nr}x{Nz}",
+                    'time_points': len(sol.t),
+                    'device_radius_mm': float(device_radius_m * 1e3),
+                    'glass_ito_boundary_nm': float(glass_ito_boundary_nm),
+                    'perovskite_mid_z_nm': float(z_nm[perovskite_mid_idx])
+                },
+                'timestamp': time.time()
+            }
+            # /api/progress 응답 본문을 여기서 한 번만 직렬화 (jsonify와 동일하게 끝에 개행)
+            # 결과 응답은 이후 바뀌지 않으므로 폴링마다 결과 dict를 다시 직렬화하지 않음
+            completed_entry['response_body'] = f"{app.json.dumps(_build_progress_response(completed_entry))}\n"
+            # 직렬화된 본문에 결과가 모두 들어 있으므로 결과 dict는 메모리에 남기지 않음
+            # (전체 데이터는 /api/result가 방금 저장한 npz에서 제공). 본문 저장과 결과 제거가
+            # 같은 항목 교체 한 번으로 반영되므로 폴링이 본문 없이 결과만 빠진 항목을 볼 수 없음
+            del completed_entry['result']
             with progress_lock:
-                progress_store[session_id] = {
-                    'progress': 100,
-                    'message': '완료!',
-                    'result_path': result_file,  # 디스크 경로도 저장 (백업용)
-                    'result': result_summary,  # JSON 형식의 결과 데이터 저장
-                    # 최소한의 메타데이터도 저장 (호환성 유지)
-                    'result_metadata': {
-                        'success': True,
-                        'session_id': session_id,
-                        'grid_size': f"{Nr}x{Nz}",
-                        'time_points': len(sol.t),
-                        'device_radius_mm': float(device_radius_m * 1e3),
-                        'glass_ito_boundary_nm': float(glass_ito_boundary_nm),
-                        'perovskite_mid_z_nm': float(z_nm[perovskite_mid_idx]) if perovskite_mid_idx is not None and perovskite_mid_idx < len(z_nm) else None
-                    },
-                    'timestamp': time.time()
-                }
+                progress_store[session_id] = completed_entry
             
             flush_print(f"=== 결과가 progress_store에 저장되었습니다 ===")
         except Exception as result_error:
@@ -1423,7 +1486,6 @@ def _simulate_worker(session_id, data):
             }
 
 if __name__ == '__main__':
-    import sys
     # fly.io나 다른 클라우드 플랫폼에서 PORT 환경 변수 사용
     # Fly.io는 PORT 환경 변수를 자동으로 설정함
     port_str = os.environ.get('PORT')
@@ -130,6 +130,21 @@ function App() {
   const celsiusToKelvin = (celsius) => celsius + 273.15
   const kelvinToCelsius = (kelvin) => kelvin - 273.15
 
+  // 백엔드의 base64 float32 blob({ shape, dtype: 'f4', data })을 중첩 배열로 복원
+  // 이미 배열이거나 null이면 그대로 반환 (하위 호환성)
+  const decodeFloat32Blob = (blob) => {
+    if (!blob || Array.isArray(blob) || typeof blob.data !== 'string') return blob
+    const binary = atob(blob.data)
+    const bytes = new Uint8Array(binary.length)
+    for (let i = 0; i < binary.length; i++) bytes[i] = binary.charCodeAt(i)
+    const flat = new Float32Array(bytes.buffer)
+    if (blob.shape.length === 1) return Array.from(flat)
+    const [rows, cols] = blob.shape
+    const nested = new Array(rows)
+    for (let i = 0; i < rows; i++) nested[i] = Array.from(flat.subarray(i * cols, (i + 1) * cols))
+    return nested
+  }
+
   const handleSimulate = async () => {
     setLoading(true)
     setError(null)
@@ -269,7 +284,11 @@ function App() {
           // 결과가 있으면 처리
           if (progressData.result && progressData.progress >= 100) {
             console.log('시뮬레이션 완료, 데이터 변환 중...')
-            const result = progressData.result
+            const result = {
+              ...progressData.result,
+              temperature_2d: decodeFloat32Blob(progressData.result.temperature_2d),
+              temp_profile_r0_z_time: decodeFloat32Blob(progressData.result.temp_profile_r0_z_time)
+            }
             
             try {
               // 켈빈을 섭씨로 변환하여 저장
@@ -0,0 +1,70 @@
+"""api/index.py 서버리스 핸들러: POST /api/simulate 직접 처리 경로와 Flask 경로의 응답 일치 확인"""
+import base64
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'api'))
+
+import index  # noqa: E402
+from app import app  # noqa: E402
+
+
+def _event(body, content_type='application/json', base64_encoded=False,
+           content_type_header='content-type', path='/api/simulate'):
+    if base64_encoded:
+        body = base64.b64encode(body.encode('utf-8')).decode('ascii')
+    return {
+        'httpMethod': 'POST',
+        'path': path,
+        'headers': {content_type_header: content_type, 'Host': 'localhost'},
+        'body': body,
+        'isBase64Encoded': base64_encoded,
+    }
+
+
+def _both_paths(monkeypatch, event):
+    """같은 이벤트를 직접 처리 경로와 (직접 처리를 끈) Flask 경로로 각각 실행"""
+    direct = index.handler(dict(event), None)
+    with monkeypatch.context() as m:
+        m.setattr(index, '_dispatch_simulate', lambda event: None)
+        flask = index.handler(dict(event), None)
+    return direct, flask
+
+
+def _without_session_id(body):
+    data = json.loads(body)
+    data.pop('session_id', None)
+    return data
+
+
+@pytest.mark.parametrize('event', [
+    _event(''),
+    _event('{}'),
+    _event('null'),
+    _event('{"layer_names": '),
+    _event(' ' * (app.config['MAX_CONTENT_LENGTH'] + 1)),
+    _event('{}', base64_encoded=True),
+    _event('', content_type_header='Content-Type'),
+    _event('{}', content_type_header='Content-Type'),
+    _event('{"layer_names": ', content_type_header='Content-Type'),
+    _event('{}', path='/simulate'),
+], ids=['empty', 'empty-object', 'null', 'invalid-json', 'too-large', 'base64-empty-object',
+        'mixed-case-header-empty', 'mixed-case-header-empty-object', 'mixed-case-header-invalid-json',
+        'unrouted-path'])
+def test_error_responses_match_flask(monkeypatch, event):
+    direct, flask = _both_paths(monkeypatch, event)
+    assert direct['statusCode'] == flask['statusCode']
+    assert direct['body'] == flask['body']
+    assert direct['statusCode'] >= 400
+
+
+@pytest.mark.parametrize('content_type_header', ['content-type', 'Content-Type'])
+def test_started_simulation_matches_flask(monkeypatch, content_type_header):
+    # 유효하지 않은 파라미터여도 시작 응답은 즉시 반환됨 (검증 오류는 워커에서 progress_store에 기록)
+    direct, flask = _both_paths(monkeypatch, _event('{"layer_names": []}', content_type_header=content_type_header))
+    assert direct['statusCode'] == flask['statusCode'] == 200
+    assert _without_session_id(direct['body']) == _without_session_id(flask['body'])
+    assert json.loads(direct['body'])['session_id'] != json.loads(flask['body'])['session_id']
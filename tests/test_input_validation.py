@@ -0,0 +1,77 @@
+"""app.py 시뮬레이션 요청 정수 파라미터(n_output, Nr) 검증 확인"""
+import pytest
+
+import app
+
+
+def _payload(**overrides):
+    payload = {
+        'layer_names': ['Glass', 'ITO', 'HTL', 'Perovskite', 'ETL', 'Cathode'],
+        'k_therm_layers': [0.8, 10.0, 0.2, 0.5, 0.2, 200.0],
+        'rho_layers': [2500, 7140, 1000, 4100, 1200, 2700],
+        'c_p_layers': [1000, 280, 1500, 250, 1500, 900],
+        'thickness_layers_nm': [1100000, 70, 80, 280, 50, 100],
+        'voltage': 2.9,
+        'current_density': 30.0,
+        'eqe': 0.2,
+        'epsilon_top': 0.05,
+        'epsilon_bottom': 0.85,
+        'epsilon_side': 0.05,
+        'h_conv': 10.0,
+        'T_ambient': 298.15,
+        't_start': 0,
+        't_end': 1.0,
+        'device_area_mm2': 4.3,
+        'r_max_multiplier': 10.0,
+    }
+    payload.update(overrides)
+    return payload
+
+
+def _run(monkeypatch, tmp_path, **overrides):
+    monkeypatch.setattr(app, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(app, 'progress_store', {})
+    app._simulate_worker('test-session', _payload(**overrides))
+    return app.progress_store['test-session']
+
+
+@pytest.mark.parametrize('value, message', [
+    (1.5, 'n_output은 정수여야 합니다'),
+    (True, 'n_output은 정수여야 합니다'),
+    ('50', 'n_output은 정수여야 합니다'),
+    (float('nan'), 'n_output은 정수여야 합니다'),
+    (float('inf'), 'n_output은 정수여야 합니다'),
+    (1, 'n_output은 최소 2 이상이어야 합니다'),
+    (app.MAX_T_EVAL_POINTS + 1, '시간 포인트 수는'),
+])
+def test_rejects_invalid_n_output(monkeypatch, tmp_path, value, message):
+    entry = _run(monkeypatch, tmp_path, n_output=value)
+    assert entry['progress'] == 0
+    assert message in entry['error']
+
+
+def test_accepts_integral_float_n_output(monkeypatch, tmp_path):
+    entry = _run(monkeypatch, tmp_path, n_output=60.0)
+    assert 'error' not in entry
+    assert entry['progress'] == 100
+    assert entry['result_metadata']['time_points'] == 60
+
+
+@pytest.mark.parametrize('value, message', [
+    (50.7, 'Nr은 정수여야 합니다'),
+    (True, 'Nr은 정수여야 합니다'),
+    ('50', 'Nr은 정수여야 합니다'),
+    (float('nan'), 'Nr은 정수여야 합니다'),
+    (2, 'Nr은 최소 3 이상이어야 합니다'),
+])
+def test_rejects_invalid_nr(monkeypatch, tmp_path, value, message):
+    entry = _run(monkeypatch, tmp_path, Nr=value)
+    assert entry['progress'] == 0
+    assert message in entry['error']
+
+
+def test_accepts_integral_float_nr(monkeypatch, tmp_path):
+    entry = _run(monkeypatch, tmp_path, Nr=50.0)
+    assert 'error' not in entry
+    assert entry['progress'] == 100
+    assert entry['result_metadata']['grid_size'].startswith('50x')
@@ -0,0 +1,30 @@
+"""app.py progress_store 세션 상한(MAX_SESSIONS) 정리 규칙 확인"""
+import app
+
+
+def test_evicts_oldest_finished_sessions_by_completion_time(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(app, 'MAX_SESSIONS', 3)
+    monkeypatch.setattr(app, 'progress_store', {
+        # 가장 먼저 생성됐지만 가장 늦게 끝난 긴 시뮬레이션은 남아야 함
+        'long': {'progress': 100, 'timestamp': 500.0},
+        'done0': {'progress': 100, 'timestamp': 100.0},
+        'done1': {'progress': 100, 'timestamp': 101.0},
+        'running': {'progress': 50, 'timestamp': 50.0},
+        'failed': {'progress': 0, 'error': 'x', 'timestamp': 200.0},
+    })
+    with app.progress_lock:
+        app._evict_finished_sessions_locked()
+    assert list(app.progress_store) == ['long', 'running', 'failed']
+
+
+def test_running_sessions_are_never_evicted(monkeypatch, tmp_path):
+    monkeypatch.setattr(app, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(app, 'MAX_SESSIONS', 1)
+    monkeypatch.setattr(app, 'progress_store', {
+        'a': {'progress': 10, 'timestamp': 1.0},
+        'b': {'progress': 20, 'timestamp': 2.0},
+    })
+    with app.progress_lock:
+        app._evict_finished_sessions_locked()
+    assert list(app.progress_store) == ['a', 'b']